@@ -1,23 +1,42 @@
 """API v1 routes for Core Agent."""
 
-from fastapi import APIRouter, Depends, HTTPException, Header
-from sqlalchemy.orm import Session
+import httpx
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Header, Request
+from fastapi.responses import StreamingResponse
+from redis.asyncio import Redis
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional, List
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from datetime import date
 
-from shared.db import get_session
+from shared.db import get_async_session
+from shared.db.models import Plan, DailyTask, TaskStatus
 from shared.schemas import AgentDecision
+from shared.observability import get_logger
 from app.services import IntakeService, PremortermService, PlanService, CheckinService
 from app.services.scoring_service import ScoringService
 
+logger = get_logger(__name__)
 
 router = APIRouter()
 
+# Cache TTLs (seconds) for the read-heavy polling endpoints
+TASKS_CACHE_TTL = 60
+METRICS_CACHE_TTL = 300
+
 
 # Request/Response schemas
+# Shared config for the request models: frozen enables cheap hashing,
+# extra='forbid' skips pydantic-core's extra-field collection path
+_request_model_config = ConfigDict(frozen=True, extra="forbid", str_strip_whitespace=True)
+
+
 class IntakeRequest(BaseModel):
     """Intake request for commitment contract."""
+    model_config = _request_model_config
+
     goal: str = Field(description="Learning goal")
     target_date: date = Field(description="Target completion date")
     weekly_hours: int = Field(ge=1, le=40, description="Hours per week")
@@ -28,11 +47,15 @@ class IntakeRequest(BaseModel):
 
 class PremortermRequest(BaseModel):
     """Premortem request for risk assessment."""
+    model_config = _request_model_config
+
     failure_reasons: List[str] = Field(description="Why might you fail in 4 weeks?")
 
 
 class CheckinRequest(BaseModel):
     """Daily check-in request."""
+    model_config = _request_model_config
+
     yesterday: Optional[str] = Field(default=None, description="What did you do yesterday?")
     today: Optional[str] = Field(default=None, description="What will you do today?")
     blockers: Optional[str] = Field(default=None, description="Any blockers?")
@@ -50,15 +73,46 @@ def get_user_id(x_user_id: Optional[str] = Header(None)) -> int:
         raise HTTPException(status_code=400, detail="Invalid user ID")
 
 
+# Dependency to get the shared Redis client
+def get_redis(request: Request) -> Redis:
+    """Get the app-lifetime Redis client."""
+    return request.app.state.redis
+
+
+# Dependency to get the shared HTTP client
+def get_http(request: Request) -> httpx.AsyncClient:
+    """Get the app-lifetime httpx client (keep-alive pooled)."""
+    return request.app.state.http_client
+
+
+async def _cache_get(redis: Redis, key: str) -> Optional[dict]:
+    """Read a cached JSON payload; treat Redis outages as a miss."""
+    try:
+        cached = await redis.get(key)
+    except Exception as e:
+        logger.warning("Redis unavailable", error=str(e))
+        return None
+    return orjson.loads(cached) if cached else None
+
+
+async def _cache_set(redis: Redis, key: str, payload: dict, ttl: int) -> None:
+    """Store a JSON payload with TTL; ignore Redis outages."""
+    try:
+        await redis.setex(key, ttl, orjson.dumps(payload))
+    except Exception as e:
+        logger.warning("Redis unavailable", error=str(e))
+
+
 # Routes
 @router.post("/intake", response_model=AgentDecision)
 async def create_intake(
     request: IntakeRequest,
-    db: Session = Depends(get_session),
+    db: AsyncSession = Depends(get_async_session),
     user_id: int = Depends(get_user_id),
+    redis: Redis = Depends(get_redis),
 ):
     """Create intake commitment contract."""
-    service = IntakeService(db)
+    service = IntakeService(db, redis=redis)
     return await service.create_commitment(
         user_id=user_id,
         goal=request.goal,
@@ -73,11 +127,12 @@ async def create_intake(
 @router.post("/premortem", response_model=AgentDecision)
 async def create_premortem(
     request: PremortermRequest,
-    db: Session = Depends(get_session),
+    db: AsyncSession = Depends(get_async_session),
     user_id: int = Depends(get_user_id),
+    redis: Redis = Depends(get_redis),
 ):
     """Process premortem risk assessment."""
-    service = PremortermService(db)
+    service = PremortermService(db, redis=redis)
     return await service.process_premortem(
         user_id=user_id,
         failure_reasons=request.failure_reasons,
@@ -87,11 +142,12 @@ async def create_premortem(
 @router.post("/plan/weekly", response_model=AgentDecision)
 async def generate_weekly_plan(
     force: bool = False,
-    db: Session = Depends(get_session),
+    db: AsyncSession = Depends(get_async_session),
     user_id: int = Depends(get_user_id),
+    redis: Redis = Depends(get_redis),
 ):
     """Generate weekly learning plan."""
-    service = PlanService(db)
+    service = PlanService(db, redis=redis)
     return await service.generate_weekly_plan(
         user_id=user_id,
         force_regenerate=force,
@@ -100,16 +156,17 @@ async def generate_weekly_plan(
 
 @router.get("/plan/current")
 async def get_current_plan(
-    db: Session = Depends(get_session),
+    db: AsyncSession = Depends(get_async_session),
     user_id: int = Depends(get_user_id),
 ):
     """Get current weekly plan."""
-    from shared.db.models import Plan
-    
-    plan = db.query(Plan).filter(
-        Plan.user_id == user_id,
-        Plan.is_active == True
-    ).first()
+    result = await db.execute(
+        select(Plan).where(
+            Plan.user_id == user_id,
+            Plan.is_active == True
+        )
+    )
+    plan = result.scalars().first()
     
     if not plan:
         return {"message": "No active plan found", "plan": None}
@@ -124,15 +181,22 @@ async def get_current_plan(
 
 @router.get("/tasks/today")
 async def get_today_tasks(
-    db: Session = Depends(get_session),
+    db: AsyncSession = Depends(get_async_session),
     user_id: int = Depends(get_user_id),
+    redis: Redis = Depends(get_redis),
 ):
     """Get today's tasks."""
+    today = date.today()
+    cache_key = f"tasks:{user_id}:{today}"
+    cached = await _cache_get(redis, cache_key)
+    if cached is not None:
+        return cached
+
     service = PlanService(db)
-    tasks = service.get_today_tasks(user_id)
-    
-    return {
-        "date": date.today().isoformat(),
+    tasks = await service.get_today_tasks(user_id)
+
+    payload = {
+        "date": today.isoformat(),
         "tasks": [
             {
                 "id": t.id,
@@ -144,38 +208,49 @@ async def get_today_tasks(
             for t in tasks
         ],
     }
+    await _cache_set(redis, cache_key, payload, TASKS_CACHE_TTL)
+    return payload
 
 
 @router.put("/tasks/{task_id}/complete")
 async def complete_task(
     task_id: int,
-    db: Session = Depends(get_session),
+    db: AsyncSession = Depends(get_async_session),
     user_id: int = Depends(get_user_id),
+    redis: Redis = Depends(get_redis),
 ):
     """Mark a task as complete."""
-    from shared.db.models import DailyTask, TaskStatus
-    from datetime import datetime
-    
-    task = db.query(DailyTask).filter(DailyTask.id == task_id).first()
-    
-    if not task:
+    # Single UPDATE ... RETURNING: no SELECT round-trip, no ORM hydration,
+    # and RETURNING doubles as the 404 check. Timestamp stays DB-side.
+    result = await db.execute(
+        update(DailyTask)
+        .where(DailyTask.id == task_id)
+        .values(status=TaskStatus.COMPLETED, completed_at=func.now())
+        .returning(DailyTask.id)
+    )
+    if result.scalar_one_or_none() is None:
         raise HTTPException(status_code=404, detail="Task not found")
-    
-    task.status = TaskStatus.COMPLETED
-    task.completed_at = datetime.utcnow()
-    db.commit()
-    
+
+    await db.commit()
+
+    # Completion changes today's task list, so drop the cached copy
+    try:
+        await redis.delete(f"tasks:{user_id}:{date.today()}")
+    except Exception as e:
+        logger.warning("Redis unavailable", error=str(e))
+
     return {"message": "Task completed", "task_id": task_id}
 
 
 @router.post("/checkin/daily", response_model=AgentDecision)
 async def daily_checkin(
     request: CheckinRequest,
-    db: Session = Depends(get_session),
+    db: AsyncSession = Depends(get_async_session),
     user_id: int = Depends(get_user_id),
+    http: httpx.AsyncClient = Depends(get_http),
 ):
     """Process daily standup check-in."""
-    service = CheckinService(db)
+    service = CheckinService(db, http=http)
     return await service.process_checkin(
         user_id=user_id,
         yesterday=request.yesterday,
@@ -184,24 +259,56 @@ async def daily_checkin(
     )
 
 
+@router.post("/checkin/daily/stream")
+async def daily_checkin_stream(
+    request: CheckinRequest,
+    db: AsyncSession = Depends(get_async_session),
+    user_id: int = Depends(get_user_id),
+    http: httpx.AsyncClient = Depends(get_http),
+):
+    """Process daily check-in, streaming guidance as server-sent events.
+
+    Emits `data:` frames with tokens as the LLM generates them, then a final
+    `event: done` frame with the complete AgentDecision JSON.
+    """
+    service = CheckinService(db, http=http)
+    return StreamingResponse(
+        service.stream_checkin(
+            user_id=user_id,
+            yesterday=request.yesterday,
+            today=request.today,
+            blockers=request.blockers,
+        ),
+        media_type="text/event-stream",
+    )
+
+
 @router.get("/metrics/summary")
 async def get_metrics_summary(
-    db: Session = Depends(get_session),
+    db: AsyncSession = Depends(get_async_session),
     user_id: int = Depends(get_user_id),
+    redis: Redis = Depends(get_redis),
 ):
     """Get metrics summary."""
+    cache_key = f"metrics:{user_id}:{date.today()}"
+    cached = await _cache_get(redis, cache_key)
+    if cached is not None:
+        return cached
+
     service = ScoringService(db)
-    return service.get_full_metrics(user_id)
+    metrics = await service.get_full_metrics(user_id)
+    await _cache_set(redis, cache_key, metrics, METRICS_CACHE_TTL)
+    return metrics
 
 
 @router.get("/commitment/current")
 async def get_current_commitment(
-    db: Session = Depends(get_session),
+    db: AsyncSession = Depends(get_async_session),
     user_id: int = Depends(get_user_id),
 ):
     """Get current active commitment."""
     service = IntakeService(db)
-    commitment = service.get_active_commitment(user_id)
+    commitment = await service.get_active_commitment(user_id)
     
     if not commitment:
         return {"message": "No active commitment", "commitment": None}
@@ -13,6 +13,7 @@ class Settings(BaseSettings):
     
     CORE_AGENT_PORT: int = 8001
     DATABASE_URL: str = "sqlite:///./dev.db"
+    REDIS_URL: str = "redis://localhost:6379/0"
     
     # LLM
     LLM_PROVIDER: str = "openai"
@@ -35,7 +36,10 @@ class Settings(BaseSettings):
 
 @lru_cache
 def get_settings() -> Settings:
-    return Settings()
-
+    """Cached settings factory.
 
-settings = get_settings()
+    Also usable directly as a FastAPI dependency (``Depends(get_settings)``),
+    so tests can swap settings via ``app.dependency_overrides[get_settings]``
+    instead of monkey-patching a module-level instance.
+    """
+    return Settings()
@@ -0,0 +1,84 @@
+"""Exact-match response cache for idempotent LLM calls."""
+
+import hashlib
+import json
+from typing import Optional
+
+import orjson
+from redis.asyncio import Redis
+
+from shared.llm import LLMProvider
+from shared.observability import get_logger
+
+logger = get_logger(__name__)
+
+# Intake analyses, plans, and premortem mitigations are near-deterministic
+# functions of their inputs, so identical prompts can reuse yesterday's answer
+LLM_CACHE_TTL = 86400
+
+
+def llm_cache_key(prompt: str, schema: dict, system_prompt: Optional[str]) -> str:
+    """Build a cache key from the exact rendered prompt, schema, and system prompt."""
+    digest = hashlib.sha256(
+        (system_prompt or "").encode()
+        + prompt.encode()
+        + json.dumps(schema, sort_keys=True).encode()
+    ).hexdigest()
+    return f"llm:{digest}"
+
+
+async def cache_get(redis: Redis, key: str) -> Optional[dict]:
+    """Fetch a cached response, treating a Redis outage as a miss."""
+    try:
+        cached = await redis.get(key)
+    except Exception as e:
+        logger.warning("Redis unavailable", error=str(e))
+        return None
+    return orjson.loads(cached) if cached else None
+
+
+async def cache_set(redis: Redis, key: str, response: dict) -> None:
+    """Store a response, ignoring Redis outages."""
+    try:
+        await redis.setex(key, LLM_CACHE_TTL, orjson.dumps(response))
+    except Exception as e:
+        logger.warning("Redis unavailable", error=str(e))
+
+
+async def cached_structured_output(
+    llm: LLMProvider,
+    redis: Optional[Redis],
+    prompt: str,
+    schema: dict,
+    system_prompt: Optional[str] = None,
+) -> dict:
+    """Call structured_output through an exact-match Redis cache.
+
+    A hit skips the LLM entirely; a Redis outage degrades to a plain call.
+
+    Args:
+        llm: LLM provider
+        redis: Redis client, or None to bypass the cache
+        prompt: Rendered user prompt
+        schema: JSON schema for the expected output
+        system_prompt: Optional system instructions
+
+    Returns:
+        Parsed JSON object matching the schema
+    """
+    if redis is None:
+        return await llm.structured_output(
+            prompt=prompt, schema=schema, system_prompt=system_prompt
+        )
+
+    key = llm_cache_key(prompt, schema, system_prompt)
+    cached = await cache_get(redis, key)
+    if cached is not None:
+        return cached
+
+    response = await llm.structured_output(
+        prompt=prompt, schema=schema, system_prompt=system_prompt
+    )
+
+    await cache_set(redis, key, response)
+    return response
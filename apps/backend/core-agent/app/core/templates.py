@@ -0,0 +1,26 @@
+"""Pre-compiled prompt templates."""
+
+import re
+
+
+class PromptTemplate:
+    """Prompt template pre-split at construction time.
+
+    Splitting once at import leaves literals at even indices and
+    placeholder names at odd indices, so rendering is a join instead of a
+    str.format parser pass per request. Brace escapes ({{ / }}) only need
+    unescaping in the literals.
+    """
+
+    def __init__(self, template: str):
+        self._parts = [
+            part if i % 2 else part.replace("{{", "{").replace("}}", "}")
+            for i, part in enumerate(re.split(r"\{(\w+)\}", template))
+        ]
+
+    def render(self, **values) -> str:
+        """Render the template with the given placeholder values."""
+        return "".join(
+            str(values[part]) if i % 2 else part
+            for i, part in enumerate(self._parts)
+        )
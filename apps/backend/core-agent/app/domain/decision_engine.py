@@ -1,7 +1,8 @@
 """Decision engine for agent actions and adaptations."""
 
 from typing import Dict, List, Optional
-from sqlalchemy.orm import Session
+from sqlalchemy import bindparam, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from shared.db.models import MemoryRule, PremortermRisk, Commitment
 from shared.schemas import AgentDecision, Signals
@@ -11,6 +12,29 @@ from shared.observability import get_logger
 logger = get_logger(__name__)
 
 
+# Hot statements built once at import: per-request construction is skipped
+# and the compiled-cache key stays stable across calls
+_ACTIVE_MITIGATIONS_STMT = (
+    select(PremortermRisk)
+    .join(Commitment, PremortermRisk.commitment_id == Commitment.id)
+    .where(
+        Commitment.user_id == bindparam("uid"),
+        Commitment.is_active == True,
+    )
+    .order_by(PremortermRisk.priority)
+    .limit(3)
+)
+
+_MEMORY_RULES_STMT = (
+    select(MemoryRule.rule_value, MemoryRule.confidence)
+    .where(
+        MemoryRule.user_id == bindparam("uid"),
+        MemoryRule.is_active == True,
+    )
+    .order_by(MemoryRule.confidence.desc())
+)
+
+
 class AdaptationPolicy:
     """Policy definitions for plan adaptations."""
     
@@ -19,7 +43,21 @@ class AdaptationPolicy:
     MEDIUM_ADHERENCE_THRESHOLD = 0.6
     LOW_KNOWLEDGE_THRESHOLD = 0.4
     LOW_RETENTION_THRESHOLD = 0.5
-    
+
+    # The three threshold checks pack into a 3-bit state; higher bits win,
+    # mirroring the old if/elif ladder (low adherence beats low retention
+    # beats high performance) without its data-dependent branches
+    _ADJUSTMENTS = (
+        "keep",                # 0b000
+        "increase_challenge",  # 0b001
+        "repeat_concepts",     # 0b010
+        "repeat_concepts",     # 0b011
+        "reduce_scope",        # 0b100
+        "reduce_scope",        # 0b101
+        "reduce_scope",        # 0b110
+        "reduce_scope",        # 0b111
+    )
+
     @classmethod
     def determine_adjustment(
         cls,
@@ -28,39 +66,35 @@ class AdaptationPolicy:
         retention: float,
     ) -> str:
         """Determine plan adjustment based on scores.
-        
+
         Returns:
             One of: 'reduce_scope', 'repeat_concepts', 'increase_challenge', 'keep'
         """
-        if adherence < cls.LOW_ADHERENCE_THRESHOLD:
-            return "reduce_scope"
-        
-        if retention < cls.LOW_RETENTION_THRESHOLD:
-            return "repeat_concepts"
-        
-        if knowledge > 0.8 and adherence > 0.8:
-            return "increase_challenge"
-        
-        return "keep"
+        state = (
+            (adherence < cls.LOW_ADHERENCE_THRESHOLD) << 2
+            | (retention < cls.LOW_RETENTION_THRESHOLD) << 1
+            | (knowledge > 0.8 and adherence > 0.8)
+        )
+        return cls._ADJUSTMENTS[state]
 
 
 class DecisionEngine:
     """Engine for generating agent decisions based on current state."""
     
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
         self.scoring = ScoringService(db)
-    
-    def get_signals(self, user_id: int) -> Signals:
+
+    async def get_signals(self, user_id: int) -> Signals:
         """Get current signals for a user.
-        
+
         Args:
             user_id: User ID
-            
+
         Returns:
             Signals object with current metrics
         """
-        metrics = self.scoring.get_full_metrics(user_id)
+        metrics = await self.scoring.get_full_metrics(user_id)
         
         return Signals(
             adherence=metrics["adherence_score"],
@@ -69,63 +103,54 @@ class DecisionEngine:
             status=metrics["status"],
         )
     
-    def get_active_mitigations(self, user_id: int) -> List[str]:
+    async def get_active_mitigations(self, user_id: int) -> List[str]:
         """Get active risk mitigations for user.
-        
+
         Args:
             user_id: User ID
-            
+
         Returns:
             List of active mitigation strategies
         """
-        # Get commitment
-        commitment = self.db.query(Commitment).filter(
-            Commitment.user_id == user_id,
-            Commitment.is_active == True
-        ).first()
-        
-        if not commitment:
-            return []
-        
-        # Get risks with mitigations
-        risks = self.db.query(PremortermRisk).filter(
-            PremortermRisk.commitment_id == commitment.id
-        ).order_by(PremortermRisk.priority).limit(3).all()
-        
+        # Join commitment -> risks so one round-trip replaces two
+        result = await self.db.execute(_ACTIVE_MITIGATIONS_STMT, {"uid": user_id})
+        risks = result.scalars().all()
+
         return [r.mitigation for r in risks if r.mitigation]
-    
-    def get_memory_rules(self, user_id: int) -> List[MemoryRule]:
+
+    async def get_memory_rules(self, user_id: int) -> List[tuple]:
         """Get active memory rules for user.
-        
+
         Args:
             user_id: User ID
-            
+
         Returns:
-            List of active memory rules
+            List of (rule_value, confidence) tuples, highest confidence first
+
+        Only the two columns callers use are selected, skipping full ORM
+        hydration (identity map + per-attribute descriptors) per row.
         """
-        return self.db.query(MemoryRule).filter(
-            MemoryRule.user_id == user_id,
-            MemoryRule.is_active == True
-        ).order_by(MemoryRule.confidence.desc()).all()
-    
-    def generate_action(self, user_id: int) -> Dict:
+        result = await self.db.execute(_MEMORY_RULES_STMT, {"uid": user_id})
+        return result.all()
+
+    async def generate_action(self, user_id: int) -> Dict:
         """Generate recommended action based on current state.
-        
+
         Args:
             user_id: User ID
-            
+
         Returns:
             Action dictionary with plan_adjustment and risk_mitigation
         """
-        signals = self.get_signals(user_id)
-        
+        signals = await self.get_signals(user_id)
+
         adjustment = AdaptationPolicy.determine_adjustment(
             signals.adherence,
             signals.knowledge,
             signals.retention,
         )
-        
-        mitigations = self.get_active_mitigations(user_id)
+
+        mitigations = await self.get_active_mitigations(user_id)
         
         # Add status-based mitigations
         if signals.status == "at_risk":
@@ -137,7 +162,7 @@ class DecisionEngine:
             "risk_mitigation": mitigations[:3],  # Max 3 active mitigations
         }
     
-    def build_decision(
+    async def build_decision(
         self,
         user_id: int,
         reason: str,
@@ -161,8 +186,8 @@ class DecisionEngine:
         """
         return AgentDecision(
             reason=reason,
-            signals=self.get_signals(user_id),
-            action=self.generate_action(user_id),
+            signals=await self.get_signals(user_id),
+            action=await self.generate_action(user_id),
             next_tasks=next_tasks,
             resources_used=resources_used or [],
             quality_score=quality_score,
@@ -1,13 +1,19 @@
 """Core Agent API - Main Application."""
 
 from contextlib import asynccontextmanager
+import httpx
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+from redis.asyncio import Redis
 
+from shared.llm import aclose_llm_providers
 from shared.observability import RequestIdMiddleware, setup_logging, get_logger, tracing
-from app.core.config import settings
+from app.core.config import get_settings
 from app.api.v1 import routes
 
+settings = get_settings()
+
 
 setup_logging(
     level=settings.LOG_LEVEL,
@@ -28,7 +34,15 @@ logger = get_logger(__name__)
 async def lifespan(app: FastAPI):
     """Application lifespan handler."""
     logger.info("Core Agent service starting", port=settings.CORE_AGENT_PORT)
+    app.state.redis = Redis.from_url(settings.REDIS_URL)
+    app.state.http_client = httpx.AsyncClient(
+        timeout=10.0,
+        limits=httpx.Limits(max_keepalive_connections=50),
+    )
     yield
+    await aclose_llm_providers()
+    await app.state.http_client.aclose()
+    await app.state.redis.aclose()
     logger.info("Core Agent service shutting down")
 
 
@@ -37,6 +51,7 @@ app = FastAPI(
     description="Planning, check-ins, and memory rules",
     version="0.1.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # Middleware
@@ -1,18 +1,37 @@
 """Check-in service for daily standups."""
 
+import asyncio
+import re
 from datetime import date
-from typing import Optional
-from sqlalchemy.orm import Session
+from typing import AsyncGenerator, Optional
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 import httpx
+import orjson
 
 from shared.llm import get_llm_provider, LLMProvider
-from shared.db.models import Checkin, Plan, DailyTask, MemoryRule, UserStatus, TaskStatus
+from shared.db.models import (
+    User,
+    Checkin,
+    Commitment,
+    Plan,
+    DailyTask,
+    MemoryRule,
+    UserStatus,
+    TaskStatus,
+)
 from shared.schemas import AgentDecision, Signals
 from shared.observability import get_logger, trace_function
-from app.core.config import settings
+from app.core.config import get_settings
+from app.core.templates import PromptTemplate
 
 logger = get_logger(__name__)
 
+# Resolved once at import: skips the cached-settings lookup and pydantic
+# attribute access plus the f-string join on every RAG call
+_RAG_RETRIEVE_URL = f"{get_settings().RAG_WORKER_URL}/v1/retrieve"
+
 
 CHECKIN_SYSTEM_PROMPT = """You are an AI learning coach processing a daily check-in.
 Your job is to:
@@ -53,13 +72,73 @@ Respond in JSON format:
 }}"""
 
 
+# Pre-split at import so per-request rendering is a join, not a format pass
+_CHECKIN_TEMPLATE = PromptTemplate(CHECKIN_PROMPT_TEMPLATE)
+
+
+CHECKIN_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "assessment": {"type": "string"},
+        "next_task": {"type": "string"},
+        "next_task_timebox": {"type": "integer"},
+        "fallback_task": {"type": "string"},
+        "blocker_advice": {"type": "string"},
+        "motivation_note": {"type": "string"},
+    },
+    "required": ["assessment", "next_task", "fallback_task"],
+}
+
+
+def _parse_llm_json(text: str) -> dict:
+    """Parse accumulated stream output into the structured response dict."""
+    try:
+        return orjson.loads(text)
+    except orjson.JSONDecodeError:
+        match = re.search(r"\{.*\}", text, re.DOTALL)
+        if match:
+            return orjson.loads(match.group())
+        raise
+
+
+def _fallback_response(blockers: Optional[str]) -> dict:
+    """Static response used when the LLM call fails."""
+    return {
+        "assessment": "Check-in received",
+        "next_task": "Continue with your planned learning",
+        "next_task_timebox": 45,
+        "fallback_task": "Review yesterday's concepts for 15 minutes",
+        "blocker_advice": "Try breaking the problem into smaller steps" if blockers else None,
+        "motivation_note": "Keep up the momentum!",
+    }
+
+
+def _no_commitment_decision() -> AgentDecision:
+    """Decision returned when the user has no active commitment."""
+    return AgentDecision(
+        reason="No active commitment found. Please complete intake first.",
+        signals=Signals(adherence=0.0, knowledge=0.0, retention=0.0, status="at_risk"),
+        action={"plan_adjustment": "keep", "risk_mitigation": []},
+        next_tasks=[{"task": "Complete intake assessment", "timebox_min": 10, "type": "review"}],
+        resources_used=[],
+        quality_score=1.0,
+        quality_flags=["no_commitment"],
+    )
+
+
 class CheckinService:
     """Service for daily standup check-ins."""
     
-    def __init__(self, db: Session, llm: Optional[LLMProvider] = None):
+    def __init__(
+        self,
+        db: AsyncSession,
+        llm: Optional[LLMProvider] = None,
+        http: Optional[httpx.AsyncClient] = None,
+    ):
         self.db = db
         self.llm = llm or get_llm_provider()
-    
+        self.http = http
+
     @trace_function(name="process_checkin", tags=["checkin", "core-agent"])
     async def process_checkin(
         self,
@@ -80,104 +159,203 @@ class CheckinService:
             AgentDecision with next steps and guidance
         """
         logger.info("Processing check-in", user_id=user_id, has_blocker=bool(blockers))
-        
-        # Get active plan and commitment
-        from shared.db.models import Commitment
-        
-        commitment = self.db.query(Commitment).filter(
-            Commitment.user_id == user_id,
-            Commitment.is_active == True
-        ).first()
-        
+
+        # Capture once: avoids repeated syscalls and the midnight-boundary
+        # case where two calls straddle a date change
+        today_date = date.today()
+
+        commitment, today_tasks, patterns = await self._load_checkin_context(
+            user_id, today_date
+        )
         if not commitment:
-            return AgentDecision(
-                reason="No active commitment found. Please complete intake first.",
-                signals=Signals(adherence=0.0, knowledge=0.0, retention=0.0, status="at_risk"),
-                action={"plan_adjustment": "keep", "risk_mitigation": []},
-                next_tasks=[{"task": "Complete intake assessment", "timebox_min": 10, "type": "review"}],
-                resources_used=[],
-                quality_score=1.0,
-                quality_flags=["no_commitment"],
-            )
-        
-        # Calculate progress
-        weeks_remaining = max(1, (commitment.target_date - date.today()).days // 7)
-        current_week = max(1, (date.today() - commitment.created_at.date()).days // 7 + 1)
-        
-        # Get today's tasks
-        plan = self.db.query(Plan).filter(
-            Plan.user_id == user_id,
-            Plan.is_active == True
-        ).first()
-        
-        today_tasks = []
-        if plan:
-            tasks = self.db.query(DailyTask).filter(
-                DailyTask.plan_id == plan.id,
-                DailyTask.date == date.today()
-            ).all()
-            today_tasks = [f"- {t.task} ({t.timebox_min}min)" for t in tasks]
-        
-        # Get memory rules (patterns)
-        memory_rules = self.db.query(MemoryRule).filter(
-            MemoryRule.user_id == user_id,
-            MemoryRule.is_active == True
-        ).limit(3).all()
-        patterns = "\n".join([f"- {r.rule_value}" for r in memory_rules]) or "None yet"
-        
-        # If blocker, try to get RAG guidance
-        rag_resources = []
-        if blockers:
-            rag_resources = await self._get_rag_guidance(blockers)
-        
-        # Process with LLM
+            return _no_commitment_decision()
+
+        prompt = self._build_prompt(
+            commitment, today_tasks, patterns, yesterday, today, blockers, today_date
+        )
+
+        # The LLM call and RAG lookup are independent of each other, so run
+        # them concurrently: wall clock is max() not sum()
+        llm_task = asyncio.create_task(self.llm.structured_output(
+            prompt=prompt,
+            schema=CHECKIN_SCHEMA,
+            system_prompt=CHECKIN_SYSTEM_PROMPT,
+        ))
+        rag_task = (
+            asyncio.create_task(self._get_rag_guidance(blockers))
+            if blockers else None
+        )
+
         try:
-            prompt = CHECKIN_PROMPT_TEMPLATE.format(
-                yesterday=yesterday or "Not specified",
-                today=today or "Not specified",
-                blockers=blockers or "None",
-                today_tasks="\n".join(today_tasks) if today_tasks else "No tasks planned",
-                goal=commitment.goal,
-                current_week=current_week,
-                weeks_remaining=weeks_remaining,
-                patterns=patterns,
-            )
-            
-            llm_response = await self.llm.structured_output(
+            llm_response = await llm_task
+        except Exception as e:
+            logger.error("LLM call failed", error=str(e))
+            llm_response = _fallback_response(blockers)
+
+        rag_resources = await rag_task if rag_task else []
+
+        return await self._finalize_checkin(
+            user_id, today_date, yesterday, today, blockers, llm_response, rag_resources
+        )
+
+    async def stream_checkin(
+        self,
+        user_id: int,
+        yesterday: Optional[str] = None,
+        today: Optional[str] = None,
+        blockers: Optional[str] = None,
+    ) -> AsyncGenerator[str, None]:
+        """Stream check-in guidance as server-sent events.
+
+        Yields raw LLM tokens as `data:` frames so the client can render
+        output as it is generated, then a final `event: done` frame carrying
+        the full AgentDecision once the response is parsed and persisted.
+        Perceived latency drops from full-completion time to first-token time.
+
+        Args:
+            user_id: User ID
+            yesterday: What they did yesterday
+            today: What they plan today
+            blockers: Any blockers
+
+        Yields:
+            SSE-framed strings for a text/event-stream response
+        """
+        logger.info("Processing streaming check-in", user_id=user_id, has_blocker=bool(blockers))
+
+        today_date = date.today()
+
+        commitment, today_tasks, patterns = await self._load_checkin_context(
+            user_id, today_date
+        )
+        if not commitment:
+            decision = _no_commitment_decision()
+            yield f"event: done\ndata: {decision.model_dump_json()}\n\n"
+            return
+
+        prompt = self._build_prompt(
+            commitment, today_tasks, patterns, yesterday, today, blockers, today_date
+        )
+
+        # RAG lookup proceeds while tokens stream
+        rag_task = (
+            asyncio.create_task(self._get_rag_guidance(blockers))
+            if blockers else None
+        )
+
+        # The prompt template already requests JSON output, so the stream is
+        # the structured response: forward tokens, then parse the whole
+        chunks: list[str] = []
+        try:
+            async for token in self.llm.stream(
                 prompt=prompt,
-                schema={
-                    "type": "object",
-                    "properties": {
-                        "assessment": {"type": "string"},
-                        "next_task": {"type": "string"},
-                        "next_task_timebox": {"type": "integer"},
-                        "fallback_task": {"type": "string"},
-                        "blocker_advice": {"type": "string"},
-                        "motivation_note": {"type": "string"},
-                    },
-                    "required": ["assessment", "next_task", "fallback_task"],
-                },
                 system_prompt=CHECKIN_SYSTEM_PROMPT,
-            )
-            
+                temperature=0.3,
+            ):
+                chunks.append(token)
+                yield f"data: {orjson.dumps({'token': token}).decode()}\n\n"
+            llm_response = _parse_llm_json("".join(chunks))
         except Exception as e:
-            logger.error("LLM call failed", error=str(e))
-            llm_response = {
-                "assessment": "Check-in received",
-                "next_task": "Continue with your planned learning",
-                "next_task_timebox": 45,
-                "fallback_task": "Review yesterday's concepts for 15 minutes",
-                "blocker_advice": "Try breaking the problem into smaller steps" if blockers else None,
-                "motivation_note": "Keep up the momentum!",
-            }
-        
+            logger.error("LLM stream failed", error=str(e))
+            llm_response = _fallback_response(blockers)
+
+        rag_resources = await rag_task if rag_task else []
+
+        decision = await self._finalize_checkin(
+            user_id, today_date, yesterday, today, blockers, llm_response, rag_resources
+        )
+        yield f"event: done\ndata: {decision.model_dump_json()}\n\n"
+
+    async def _load_checkin_context(
+        self, user_id: int, today_date: date
+    ) -> tuple[Optional[Commitment], list[str], str]:
+        """Fetch the check-in context for a user.
+
+        Gets commitment, active plan, today's tasks, and memory rules in a
+        single eager-loaded user fetch instead of 4 sequential SELECTs.
+
+        Returns:
+            (commitment, today's task lines, patterns text); commitment is
+            None when the user has no active commitment.
+        """
+        stmt = (
+            select(User)
+            .where(User.id == user_id)
+            .options(
+                selectinload(User.commitments.and_(Commitment.is_active == True)),
+                selectinload(User.plans.and_(Plan.is_active == True))
+                .selectinload(Plan.daily_tasks.and_(DailyTask.date == today_date)),
+                selectinload(User.memory_rules.and_(MemoryRule.is_active == True)),
+            )
+        )
+        result = await self.db.execute(stmt)
+        user = result.scalars().first()
+
+        commitment = user.commitments[0] if user and user.commitments else None
+        if not commitment:
+            return None, [], ""
+
+        plan = user.plans[0] if user.plans else None
+        today_tasks = (
+            [f"- {t.task} ({t.timebox_min}min)" for t in plan.daily_tasks]
+            if plan else []
+        )
+
+        # Memory rules (patterns), top-3 by confidence
+        memory_rules = sorted(
+            user.memory_rules, key=lambda r: r.confidence, reverse=True
+        )[:3]
+        patterns = "\n".join([f"- {r.rule_value}" for r in memory_rules]) or "None yet"
+
+        return commitment, today_tasks, patterns
+
+    def _build_prompt(
+        self,
+        commitment: Commitment,
+        today_tasks: list[str],
+        patterns: str,
+        yesterday: Optional[str],
+        today: Optional[str],
+        blockers: Optional[str],
+        today_date: date,
+    ) -> str:
+        """Build the check-in prompt for the LLM."""
+        weeks_remaining = max(1, commitment.weeks_until_target(today_date))
+        current_week = max(1, commitment.weeks_since_start(today_date) + 1)
+
+        return _CHECKIN_TEMPLATE.render(
+            yesterday=yesterday or "Not specified",
+            today=today or "Not specified",
+            blockers=blockers or "None",
+            today_tasks="\n".join(today_tasks) if today_tasks else "No tasks planned",
+            goal=commitment.goal,
+            current_week=current_week,
+            weeks_remaining=weeks_remaining,
+            patterns=patterns,
+        )
+
+    async def _finalize_checkin(
+        self,
+        user_id: int,
+        today_date: date,
+        yesterday: Optional[str],
+        today: Optional[str],
+        blockers: Optional[str],
+        llm_response: dict,
+        rag_resources: list,
+    ) -> AgentDecision:
+        """Persist the check-in row and build the AgentDecision.
+
+        The check-in insert and any memory-rule upserts commit together:
+        one transaction means one fsync instead of two per check-in.
+        """
         # Determine advice content
         advice_text = llm_response.get("blocker_advice") or llm_response.get("motivation_note")
 
         # Save check-in
         checkin = Checkin(
             user_id=user_id,
-            date=date.today(),
+            date=today_date,
             yesterday=yesterday,
             today=today,
             blockers=blockers,
@@ -186,14 +364,14 @@ class CheckinService:
             advice=advice_text,
         )
         self.db.add(checkin)
-        self.db.commit()
-        
-        # Update memory if pattern detected
-        await self._update_memory_rules(user_id, yesterday, blockers)
-        
+        mem_stmt = self._memory_rule_upsert(user_id, yesterday, blockers)
+        if mem_stmt is not None:
+            await self.db.execute(mem_stmt)
+        await self.db.commit()
+
         # Calculate adherence based on yesterday's completion
         adherence = 0.8 if yesterday and len(yesterday) > 10 else 0.5
-        
+
         # Build response
         next_tasks = [
             {
@@ -202,14 +380,14 @@ class CheckinService:
                 "type": "reading",
             }
         ]
-        
+
         if llm_response.get("fallback_task"):
             next_tasks.append({
                 "task": f"[Fallback] {llm_response['fallback_task']}",
                 "timebox_min": 20,
                 "type": "review",
             })
-        
+
         return AgentDecision(
             reason=llm_response.get("assessment", "Check-in processed"),
             advice=advice_text,
@@ -229,67 +407,90 @@ class CheckinService:
             quality_flags=[],
         )
     
+    # RAG is best-effort: fall through with no resources after this soft
+    # deadline instead of letting the full client timeout gate the check-in
+    RAG_SOFT_TIMEOUT = 2.5
+
     async def _get_rag_guidance(self, blocker: str) -> list:
         """Get RAG guidance for a blocker."""
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.post(
-                    f"{settings.RAG_WORKER_URL}/v1/retrieve",
-                    json={"query": blocker, "top_k": 3},
+            if self.http is not None:
+                # Shared app-lifetime client: keep-alive skips TCP+TLS setup
+                response = await asyncio.wait_for(
+                    self.http.post(
+                        _RAG_RETRIEVE_URL,
+                        json={"query": blocker, "top_k": 3},
+                    ),
+                    timeout=self.RAG_SOFT_TIMEOUT,
                 )
-                if response.status_code == 200:
-                    data = response.json()
-                    return data.get("citations", [])
+            else:
+                # Fallback for callers that don't inject a client
+                async with httpx.AsyncClient(timeout=10.0) as client:
+                    response = await asyncio.wait_for(
+                        client.post(
+                            _RAG_RETRIEVE_URL,
+                            json={"query": blocker, "top_k": 3},
+                        ),
+                        timeout=self.RAG_SOFT_TIMEOUT,
+                    )
+            if response.status_code == 200:
+                data = response.json()
+                return data.get("citations", [])
+        except asyncio.TimeoutError:
+            logger.warning("RAG lookup exceeded soft deadline", timeout=self.RAG_SOFT_TIMEOUT)
         except Exception as e:
             logger.warning("RAG service unavailable", error=str(e))
         return []
     
-    async def _update_memory_rules(
+    def _memory_rule_upsert(
         self,
         user_id: int,
         yesterday: Optional[str],
         blockers: Optional[str],
     ):
-        """Update memory rules based on check-in patterns."""
+        """Build the memory-rule upsert for check-in patterns, if any.
+
+        Returns:
+            An insert statement to execute in the caller's transaction, or
+            None when the check-in matched no patterns.
+        """
         # Simple pattern detection - can be enhanced with LLM
-        
+        to_upsert: list[tuple[str, str]] = []
+
         # Check for skipping pattern
         if not yesterday or yesterday.lower() in ["nothing", "didn't do anything", "skipped"]:
-            await self._add_or_update_rule(
-                user_id,
-                "task_skip",
-                "User skipped learning session",
+            to_upsert.append(
+                ("task_skip", "User skipped learning session")
             )
-        
+
         # Check for blocker pattern
         if blockers and "time" in blockers.lower():
-            await self._add_or_update_rule(
-                user_id,
-                "time_constraint",
-                "User frequently has time constraints - prefer shorter tasks",
+            to_upsert.append(
+                ("time_constraint", "User frequently has time constraints - prefer shorter tasks")
             )
-    
-    async def _add_or_update_rule(
-        self,
-        user_id: int,
-        rule_type: str,
-        rule_value: str,
-    ):
-        """Add or update a memory rule."""
-        existing = self.db.query(MemoryRule).filter(
-            MemoryRule.user_id == user_id,
-            MemoryRule.rule_type == rule_type,
-        ).first()
-        
-        if existing:
-            existing.confidence = min(1.0, existing.confidence + 0.1)
+
+        if not to_upsert:
+            return None
+
+        # Atomic INSERT ... ON CONFLICT DO UPDATE: one round-trip, no
+        # read-then-write race on the (user_id, rule_type) key
+        if self.db.get_bind().dialect.name == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+            least = func.least
         else:
-            rule = MemoryRule(
-                user_id=user_id,
-                rule_type=rule_type,
-                rule_value=rule_value,
-                confidence=0.5,
-            )
-            self.db.add(rule)
-        
-        self.db.commit()
+            from sqlalchemy.dialects.sqlite import insert
+            least = func.min  # two-argument scalar min() is SQLite's LEAST
+
+        stmt = insert(MemoryRule).values([
+            {
+                "user_id": user_id,
+                "rule_type": rule_type,
+                "rule_value": rule_value,
+                "confidence": 0.5,
+            }
+            for rule_type, rule_value in to_upsert
+        ])
+        return stmt.on_conflict_do_update(
+            index_elements=["user_id", "rule_type"],
+            set_={"confidence": least(1.0, MemoryRule.confidence + 0.1)},
+        )
@@ -1,13 +1,17 @@
 """Intake service for commitment contract creation."""
 
+import asyncio
 from datetime import date
 from typing import Optional
-from sqlalchemy.orm import Session
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from shared.llm import get_llm_provider, LLMProvider
 from shared.db.models import User, Commitment, LearningStyle
 from shared.schemas import AgentDecision, Signals, NextTask
 from shared.observability import get_logger, trace_function
+from app.core.llm_cache import cached_structured_output
+from app.core.templates import PromptTemplate
 
 logger = get_logger(__name__)
 
@@ -22,15 +26,9 @@ Your job is to:
 Always be supportive but honest about what's achievable."""
 
 
-INTAKE_PROMPT_TEMPLATE = """User wants to learn:
-Goal: {goal}
-Target Date: {target_date}
-Weekly Hours Available: {weekly_hours}
-Background: {background}
-Current Level: {baseline_level}
-Learning Style Preference: {learning_style}
-
-Create a personalized response that:
+# Static instructions first, user-specific fields last: keeps the shared
+# prefix identical across calls so provider-side prompt caching can reuse it
+INTAKE_PROMPT_TEMPLATE = """Create a personalized response that:
 1. Validates their goal
 2. Estimates if the timeline is achievable
 3. Suggests the best approach for their learning style
@@ -42,15 +40,35 @@ Respond in JSON format:
     "timeline_assessment": "realistic|ambitious|conservative",
     "recommended_approach": "Description of suggested learning path",
     "initial_tasks": ["Task 1", "Task 2"]
-}}"""
+}}
+
+User wants to learn:
+Goal: {goal}
+Target Date: {target_date}
+Weekly Hours Available: {weekly_hours}
+Background: {background}
+Current Level: {baseline_level}
+Learning Style Preference: {learning_style}"""
+
+# Pre-split at import so per-request rendering is a join, not a format pass
+_INTAKE_TEMPLATE = PromptTemplate(INTAKE_PROMPT_TEMPLATE)
+
+# Valid learning-style values, built once for O(1) membership checks
+_LEARNING_STYLE_VALUES = frozenset(e.value for e in LearningStyle)
 
 
 class IntakeService:
     """Service for handling user intake and commitment creation."""
     
-    def __init__(self, db: Session, llm: Optional[LLMProvider] = None):
+    def __init__(
+        self,
+        db: AsyncSession,
+        llm: Optional[LLMProvider] = None,
+        redis=None,
+    ):
         self.db = db
         self.llm = llm or get_llm_provider()
+        self.redis = redis
     
     @trace_function(name="create_commitment", tags=["intake", "core-agent"])
     async def create_commitment(
@@ -78,16 +96,50 @@ class IntakeService:
             AgentDecision with commitment details and first steps
         """
         logger.info("Creating commitment", user_id=user_id, goal=goal[:50])
-        
-        # Deactivate any existing active commitments
-        self.db.query(Commitment).filter(
-            Commitment.user_id == user_id,
-            Commitment.is_active == True
-        ).update({"is_active": False})
-        
+
+        # Kick off the LLM analysis first: the prompt depends only on the
+        # request inputs, so the DB writes below run while it is in flight
+        # and their latency disappears behind the LLM round-trip
+        prompt = _INTAKE_TEMPLATE.render(
+            goal=goal,
+            target_date=target_date,
+            weekly_hours=weekly_hours,
+            background=background or "Not specified",
+            baseline_level=baseline_level or "Not specified",
+            learning_style=learning_style,
+        )
+        llm_task = asyncio.create_task(cached_structured_output(
+            self.llm,
+            self.redis,
+            prompt=prompt,
+            schema={
+                "type": "object",
+                "properties": {
+                    "reason": {"type": "string"},
+                    "timeline_assessment": {"type": "string"},
+                    "recommended_approach": {"type": "string"},
+                    "initial_tasks": {"type": "array", "items": {"type": "string"}},
+                },
+                "required": ["reason", "timeline_assessment", "initial_tasks"],
+            },
+            system_prompt=INTAKE_SYSTEM_PROMPT,
+        ))
+
+        # Deactivate any existing active commitments; nothing stale is in
+        # the identity map here, so skip the session-synchronization pass
+        await self.db.execute(
+            update(Commitment)
+            .where(
+                Commitment.user_id == user_id,
+                Commitment.is_active == True
+            )
+            .values(is_active=False)
+            .execution_options(synchronize_session=False)
+        )
+
         # Create new commitment
-        style_enum = LearningStyle(learning_style) if learning_style in [e.value for e in LearningStyle] else LearningStyle.MIXED
-        
+        style_enum = LearningStyle(learning_style) if learning_style in _LEARNING_STYLE_VALUES else LearningStyle.MIXED
+
         commitment = Commitment(
             user_id=user_id,
             goal=goal,
@@ -98,40 +150,20 @@ class IntakeService:
             learning_style=style_enum,
             is_active=True,
         )
-        
+
+        # flush populates the PK during the INSERT; with expire_on_commit
+        # disabled there is nothing for a post-commit refresh to reload
         self.db.add(commitment)
-        self.db.commit()
-        self.db.refresh(commitment)
-        
+        await self.db.flush()
+        await self.db.commit()
+
         # Get LLM analysis
         try:
-            prompt = INTAKE_PROMPT_TEMPLATE.format(
-                goal=goal,
-                target_date=target_date,
-                weekly_hours=weekly_hours,
-                background=background or "Not specified",
-                baseline_level=baseline_level or "Not specified",
-                learning_style=learning_style,
-            )
-            
-            llm_response = await self.llm.structured_output(
-                prompt=prompt,
-                schema={
-                    "type": "object",
-                    "properties": {
-                        "reason": {"type": "string"},
-                        "timeline_assessment": {"type": "string"},
-                        "recommended_approach": {"type": "string"},
-                        "initial_tasks": {"type": "array", "items": {"type": "string"}},
-                    },
-                    "required": ["reason", "timeline_assessment", "initial_tasks"],
-                },
-                system_prompt=INTAKE_SYSTEM_PROMPT,
-            )
-            
+            llm_response = await llm_task
+
             reason = llm_response.get("reason", "Commitment created successfully")
             initial_tasks = llm_response.get("initial_tasks", ["Complete premortem assessment"])
-            
+
         except Exception as e:
             logger.error("LLM call failed", error=str(e))
             reason = "Commitment created successfully. Let's start with a premortem assessment."
@@ -172,9 +204,12 @@ class IntakeService:
             quality_flags=[],
         )
     
-    def get_active_commitment(self, user_id: int) -> Optional[Commitment]:
+    async def get_active_commitment(self, user_id: int) -> Optional[Commitment]:
         """Get user's active commitment."""
-        return self.db.query(Commitment).filter(
-            Commitment.user_id == user_id,
-            Commitment.is_active == True
-        ).first()
+        result = await self.db.execute(
+            select(Commitment).where(
+                Commitment.user_id == user_id,
+                Commitment.is_active == True
+            )
+        )
+        return result.scalars().first()
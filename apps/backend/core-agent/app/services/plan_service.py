@@ -3,12 +3,16 @@
 import json
 from datetime import date, timedelta
 from typing import Optional, List, Dict
-from sqlalchemy.orm import Session
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
 from shared.llm import get_llm_provider, LLMProvider
-from shared.db.models import Commitment, Plan, DailyTask, PremortermRisk, MemoryRule, TaskType, TaskStatus
+from shared.db.models import User, Commitment, Plan, DailyTask, PremortermRisk, MemoryRule, TaskType, TaskStatus
 from shared.schemas import AgentDecision, Signals
 from shared.observability import get_logger, trace_function
+from app.core.llm_cache import cache_get, cache_set, llm_cache_key
+from app.core.templates import PromptTemplate
 
 logger = get_logger(__name__)
 
@@ -23,7 +27,32 @@ Your job is to:
 Create realistic, actionable plans with clear timeboxes."""
 
 
-PLAN_PROMPT_TEMPLATE = """User's learning goal: {goal}
+# Static instructions first, user-specific fields last: keeps the shared
+# prefix identical across calls so provider-side prompt caching can reuse it
+PLAN_PROMPT_TEMPLATE = """Create a weekly learning plan.
+- Distribute tasks across all 7 days (Monday-Sunday) to build a consistent habit.
+- Do NOT skip weekends unless weekly hours are very low (<5h).
+- Each task should be:
+- Specific and actionable
+- Timeboxed (20, 45, or 90 minutes)
+- Tagged as reading, coding, or review
+
+Respond in JSON format:
+{{
+    "week_focus": "Main theme for this week",
+    "tasks": [
+        {{
+            "task": "Specific task description",
+            "timebox_min": 45,
+            "type": "reading|coding|review",
+            "day": 1
+        }}
+    ],
+    "micro_project": "Optional small project for the week",
+    "review_topics": ["Topic 1", "Topic 2"]
+}}
+
+User's learning goal: {goal}
 Target date: {target_date} ({weeks_remaining} weeks remaining)
 Weekly hours available: {weekly_hours}
 Learning style: {learning_style}
@@ -34,9 +63,13 @@ Previous risks identified:
 {risks}
 
 Memory rules (patterns to consider):
-{memory_rules}
+{memory_rules}"""
+
+# Pre-split at import so per-request rendering is a join, not a format pass
+_PLAN_TEMPLATE = PromptTemplate(PLAN_PROMPT_TEMPLATE)
 
-Create a weekly learning plan.
+# Bulk variant for cron-style regeneration: one call plans several learners
+BULK_PLAN_PROMPT_TEMPLATE = """Create a weekly learning plan for EACH of the learners listed below.
 - Distribute tasks across all 7 days (Monday-Sunday) to build a consistent habit.
 - Do NOT skip weekends unless weekly hours are very low (<5h).
 - Each task should be:
@@ -44,28 +77,84 @@ Create a weekly learning plan.
 - Timeboxed (20, 45, or 90 minutes)
 - Tagged as reading, coding, or review
 
-Respond in JSON format:
+Respond in JSON format with one entry per learner, keeping each entry's
+"learner_id" exactly as given:
 {{
-    "week_focus": "Main theme for this week",
-    "tasks": [
+    "plans": [
         {{
-            "task": "Specific task description",
-            "timebox_min": 45,
-            "type": "reading|coding|review",
-            "day": 1
+            "learner_id": 1,
+            "week_focus": "Main theme for this week",
+            "tasks": [
+                {{
+                    "task": "Specific task description",
+                    "timebox_min": 45,
+                    "type": "reading|coding|review",
+                    "day": 1
+                }}
+            ]
         }}
-    ],
-    "micro_project": "Optional small project for the week",
-    "review_topics": ["Topic 1", "Topic 2"]
-}}"""
+    ]
+}}
+
+Learners:
+{learners}"""
+
+_BULK_PLAN_TEMPLATE = PromptTemplate(BULK_PLAN_PROMPT_TEMPLATE)
+
+PLAN_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "week_focus": {"type": "string"},
+        "tasks": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "task": {"type": "string"},
+                    "timebox_min": {"type": "integer"},
+                    "type": {"type": "string"},
+                    "day": {"type": "integer"},
+                },
+            },
+        },
+        "micro_project": {"type": "string"},
+        "review_topics": {"type": "array", "items": {"type": "string"}},
+    },
+    "required": ["week_focus", "tasks"],
+}
+
+BULK_PLAN_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "plans": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "learner_id": {"type": "integer"},
+                    "week_focus": {"type": "string"},
+                    "tasks": PLAN_SCHEMA["properties"]["tasks"],
+                },
+                "required": ["learner_id", "week_focus", "tasks"],
+            },
+        },
+    },
+    "required": ["plans"],
+}
 
 
 class PlanService:
     """Service for weekly and daily planning."""
     
-    def __init__(self, db: Session, llm: Optional[LLMProvider] = None):
+    def __init__(
+        self,
+        db: AsyncSession,
+        llm: Optional[LLMProvider] = None,
+        redis=None,
+    ):
         self.db = db
         self.llm = llm or get_llm_provider()
+        self.redis = redis
     
     @trace_function(name="generate_weekly_plan", tags=["planning", "core-agent"])
     async def generate_weekly_plan(
@@ -83,13 +172,29 @@ class PlanService:
             AgentDecision with weekly plan
         """
         logger.info("Generating weekly plan", user_id=user_id)
-        
-        # Get active commitment
-        commitment = self.db.query(Commitment).filter(
-            Commitment.user_id == user_id,
-            Commitment.is_active == True
-        ).first()
-        
+
+        week_start = self._get_week_start(date.today())
+
+        # Get commitment, this week's plan, risks, and memory rules in a
+        # single eager-loaded user fetch instead of 4 sequential SELECTs
+        stmt = (
+            select(User)
+            .where(User.id == user_id)
+            .options(
+                selectinload(User.commitments.and_(Commitment.is_active == True))
+                .selectinload(Commitment.premortem_risks),
+                selectinload(User.plans.and_(
+                    Plan.is_active == True,
+                    Plan.week_start == week_start,
+                )),
+                selectinload(User.memory_rules.and_(MemoryRule.is_active == True)),
+            )
+        )
+        result = await self.db.execute(stmt)
+        user = result.scalars().first()
+
+        commitment = user.commitments[0] if user and user.commitments else None
+
         if not commitment:
             return AgentDecision(
                 reason="No active commitment found. Please complete intake first.",
@@ -102,118 +207,296 @@ class PlanService:
             )
         
         # Calculate current week
-        week_start = self._get_week_start(date.today())
-        weeks_remaining = max(1, (commitment.target_date - date.today()).days // 7)
-        current_week = max(1, (date.today() - commitment.created_at.date()).days // 7 + 1)
-        
-        # Check for existing plan
-        existing_plan = self.db.query(Plan).filter(
-            Plan.user_id == user_id,
-            Plan.week_start == week_start,
-            Plan.is_active == True
-        ).first()
-        
+        today = date.today()
+        weeks_remaining = max(1, commitment.weeks_until_target(today))
+        current_week = max(1, commitment.weeks_since_start(today) + 1)
+
+        existing_plan = user.plans[0] if user.plans else None
+
         if existing_plan and not force_regenerate:
             return self._plan_to_decision(existing_plan, commitment)
-        
-        # Get risks and memory rules
-        risks = self.db.query(PremortermRisk).filter(
-            PremortermRisk.commitment_id == commitment.id
-        ).order_by(PremortermRisk.priority).limit(3).all()
-        
-        memory_rules = self.db.query(MemoryRule).filter(
-            MemoryRule.user_id == user_id,
-            MemoryRule.is_active == True
-        ).all()
-        
+
+        # Risks and memory rules came with the eager load; top-3 risks by
+        # priority, sorted here rather than in a separate ordered query
+        risks = sorted(commitment.premortem_risks, key=lambda r: r.priority)[:3]
+        memory_rules = user.memory_rules
+
         risks_text = "\n".join([f"- {r.risk}: {r.mitigation}" for r in risks]) or "None identified"
         rules_text = "\n".join([f"- {r.rule_value}" for r in memory_rules]) or "None yet"
         
+        # Very low weekly hours always get the lightweight template plan;
+        # skipping the LLM round-trip entirely for the easy case
+        if commitment.weekly_hours < 3:
+            return await self._persist_plan(
+                user_id, week_start, existing_plan, self._default_plan(commitment), commitment
+            )
+
         # Generate plan with LLM
-        try:
-            prompt = PLAN_PROMPT_TEMPLATE.format(
-                goal=commitment.goal,
-                target_date=commitment.target_date,
-                weeks_remaining=weeks_remaining,
-                weekly_hours=commitment.weekly_hours,
-                learning_style=commitment.learning_style.value,
-                baseline_level=commitment.baseline_level or "beginner",
-                current_week=current_week,
-                risks=risks_text,
-                memory_rules=rules_text,
+        prompt = _PLAN_TEMPLATE.render(
+            goal=commitment.goal,
+            target_date=commitment.target_date,
+            weeks_remaining=weeks_remaining,
+            weekly_hours=commitment.weekly_hours,
+            learning_style=commitment.learning_style.value,
+            baseline_level=commitment.baseline_level or "beginner",
+            current_week=current_week,
+            risks=risks_text,
+            memory_rules=rules_text,
+        )
+
+        # A cache hit still serves the whole plan without touching the LLM;
+        # on a miss, stream the response so task inserts overlap generation
+        if self.redis is not None:
+            cached = await cache_get(
+                self.redis, llm_cache_key(prompt, PLAN_SCHEMA, PLAN_SYSTEM_PROMPT)
             )
-            
-            llm_response = await self.llm.structured_output(
-                prompt=prompt,
-                schema={
-                    "type": "object",
-                    "properties": {
-                        "week_focus": {"type": "string"},
-                        "tasks": {
-                            "type": "array",
-                            "items": {
-                                "type": "object",
-                                "properties": {
-                                    "task": {"type": "string"},
-                                    "timebox_min": {"type": "integer"},
-                                    "type": {"type": "string"},
-                                    "day": {"type": "integer"},
-                                },
-                            },
-                        },
-                        "micro_project": {"type": "string"},
-                        "review_topics": {"type": "array", "items": {"type": "string"}},
-                    },
-                    "required": ["week_focus", "tasks"],
-                },
-                system_prompt=PLAN_SYSTEM_PROMPT,
+            if cached is not None:
+                return await self._persist_plan(
+                    user_id, week_start, existing_plan, cached, commitment
+                )
+
+        try:
+            return await self._stream_plan(
+                user_id, week_start, existing_plan, commitment, prompt
             )
-            
         except Exception as e:
             logger.error("LLM call failed", error=str(e))
-            llm_response = self._default_plan(commitment)
-        
+            await self.db.rollback()
+            # The rollback expired every object loaded in this session, and
+            # reading an expired attribute would raise MissingGreenlet rather
+            # than lazy-load; re-fetch the rows the fallback still needs
+            await self.db.refresh(commitment)
+            if existing_plan is not None:
+                await self.db.refresh(existing_plan)
+            return await self._persist_plan(
+                user_id, week_start, existing_plan, self._default_plan(commitment), commitment
+            )
+
+    async def _stream_plan(
+        self,
+        user_id: int,
+        week_start: date,
+        existing_plan: Optional[Plan],
+        commitment: Commitment,
+        prompt: str,
+    ) -> AgentDecision:
+        """Persist a plan incrementally from the LLM token stream.
+
+        The plan row is created up front (flushed for its PK), then daily
+        tasks are inserted in batches of 4 as the stream completes them, so
+        DB writes overlap the remaining LLM generation time instead of
+        waiting for the full response.
+        """
+        if existing_plan:
+            existing_plan.is_active = False
+            new_version = existing_plan.version + 1
+        else:
+            new_version = 1
+
+        plan = Plan(
+            user_id=user_id,
+            week_start=week_start,
+            version=new_version,
+            plan_json={},
+            is_active=True,
+        )
+        self.db.add(plan)
+        await self.db.flush()
+
+        plan_json: Dict = {}
+        batch: List[Dict] = []
+        stream = self.llm.structured_output_stream(
+            prompt=prompt,
+            schema=PLAN_SCHEMA,
+            array_field="tasks",
+            system_prompt=PLAN_SYSTEM_PROMPT,
+        )
+        async for kind, fragment in stream:
+            if kind == "item":
+                batch.append(self._task_row(plan.id, week_start, fragment))
+                if len(batch) >= 4:
+                    await self.db.execute(insert(DailyTask), batch)
+                    batch = []
+            else:
+                plan_json = fragment
+
+        if batch:
+            await self.db.execute(insert(DailyTask), batch)
+
+        plan.plan_json = plan_json
+        await self.db.commit()
+
+        if self.redis is not None:
+            await cache_set(
+                self.redis,
+                llm_cache_key(prompt, PLAN_SCHEMA, PLAN_SYSTEM_PROMPT),
+                plan_json,
+            )
+
+        return self._plan_to_decision(plan, commitment)
+
+    async def _persist_plan(
+        self,
+        user_id: int,
+        week_start: date,
+        existing_plan: Optional[Plan],
+        plan_json: Dict,
+        commitment: Commitment,
+    ) -> AgentDecision:
+        """Save a generated plan plus its daily tasks and build the decision."""
         # Deactivate old plans
         if existing_plan:
             existing_plan.is_active = False
             new_version = existing_plan.version + 1
         else:
             new_version = 1
-        
+
         # Create new plan
         plan = Plan(
             user_id=user_id,
             week_start=week_start,
             version=new_version,
-            plan_json=llm_response,
+            plan_json=plan_json,
             is_active=True,
         )
         self.db.add(plan)
-        self.db.commit()
-        self.db.refresh(plan)
-        
+        await self.db.commit()
+        await self.db.refresh(plan)
+
         # Create daily tasks
-        self._create_daily_tasks(plan, llm_response.get("tasks", []))
-        
+        await self._create_daily_tasks(plan, plan_json.get("tasks", []))
+
         return self._plan_to_decision(plan, commitment)
     
-    def get_today_tasks(self, user_id: int) -> List[DailyTask]:
-        """Get tasks for today."""
+    @trace_function(name="generate_weekly_plans_bulk", tags=["planning", "core-agent"])
+    async def generate_weekly_plans_bulk(self, user_ids: List[int]) -> Dict[int, Dict]:
+        """Generate weekly plans for several users with one LLM call.
+
+        Meant for cron-style regeneration: marshals every user's commitment
+        into a single prompt, so N users cost one LLM round-trip (and one
+        slot under request-per-minute limits) instead of N, then bulk-inserts
+        all plans and their tasks.
+
+        Args:
+            user_ids: Users to (re)generate plans for
+
+        Returns:
+            Mapping of user_id to the stored plan JSON
+        """
+        logger.info("Generating weekly plans in bulk", num_users=len(user_ids))
+
         today = date.today()
-        
-        # Get active plan
-        plan = self.db.query(Plan).filter(
-            Plan.user_id == user_id,
-            Plan.is_active == True
-        ).first()
-        
-        if not plan:
-            return []
-        
-        return self.db.query(DailyTask).filter(
-            DailyTask.plan_id == plan.id,
-            DailyTask.date == today
-        ).all()
+        week_start = self._get_week_start(today)
+
+        result = await self.db.execute(
+            select(Commitment).where(
+                Commitment.user_id.in_(user_ids),
+                Commitment.is_active == True,
+            )
+        )
+        commitments = {c.user_id: c for c in result.scalars().all()}
+
+        if not commitments:
+            return {}
+
+        learners = "\n".join(
+            f"- learner_id: {c.user_id}\n"
+            f"  goal: {c.goal}\n"
+            f"  weekly_hours: {c.weekly_hours}\n"
+            f"  learning_style: {c.learning_style.value}\n"
+            f"  current_level: {c.baseline_level or 'beginner'}\n"
+            f"  weeks_remaining: {max(1, c.weeks_until_target(today))}"
+            for c in commitments.values()
+        )
+
+        try:
+            llm_response = await self.llm.structured_output(
+                prompt=_BULK_PLAN_TEMPLATE.render(learners=learners),
+                schema=BULK_PLAN_SCHEMA,
+                system_prompt=PLAN_SYSTEM_PROMPT,
+            )
+            plans_by_user = {
+                entry.get("learner_id"): entry
+                for entry in llm_response.get("plans", [])
+            }
+        except Exception as e:
+            logger.error("LLM call failed", error=str(e))
+            plans_by_user = {}
+
+        # Deactivate this week's active plans and pick up version numbers
+        result = await self.db.execute(
+            select(Plan).where(
+                Plan.user_id.in_(list(commitments)),
+                Plan.is_active == True,
+                Plan.week_start == week_start,
+            )
+        )
+        old_plans = {p.user_id: p for p in result.scalars().all()}
+
+        stored: Dict[int, Dict] = {}
+        new_plans: List[Plan] = []
+        for uid, commitment in commitments.items():
+            plan_json = plans_by_user.get(uid) or self._default_plan(commitment)
+            plan_json.pop("learner_id", None)
+
+            old = old_plans.get(uid)
+            if old:
+                old.is_active = False
+
+            plan = Plan(
+                user_id=uid,
+                week_start=week_start,
+                version=old.version + 1 if old else 1,
+                plan_json=plan_json,
+                is_active=True,
+            )
+            self.db.add(plan)
+            new_plans.append(plan)
+            stored[uid] = plan_json
+
+        # One flush assigns every plan its PK, then every user's tasks go
+        # in as a single executemany
+        await self.db.flush()
+
+        rows = [
+            self._task_row(plan.id, week_start, t)
+            for plan in new_plans
+            for t in (plan.plan_json.get("tasks") or [])
+        ]
+        if rows:
+            await self.db.execute(insert(DailyTask), rows)
+
+        await self.db.commit()
+        return stored
+
+    async def get_today_tasks(self, user_id: int) -> List:
+        """Get tasks for today.
+
+        Returns named-tuple rows with just the columns the tasks payload
+        uses, skipping full ORM instances for this read-only listing.
+        """
+        today = date.today()
+
+        active_plan_id = (
+            select(Plan.id)
+            .where(Plan.user_id == user_id, Plan.is_active == True)
+            .limit(1)
+            .scalar_subquery()
+        )
+
+        result = await self.db.execute(
+            select(
+                DailyTask.id,
+                DailyTask.task,
+                DailyTask.timebox_min,
+                DailyTask.task_type,
+                DailyTask.status,
+            ).where(
+                DailyTask.plan_id == active_plan_id,
+                DailyTask.date == today,
+            )
+        )
+        return result.all()
     
     def _get_week_start(self, d: date) -> date:
         """Get Monday of the week."""
@@ -249,31 +532,37 @@ class PlanService:
             quality_flags=[],
         )
     
-    def _create_daily_tasks(self, plan: Plan, tasks: List[Dict]):
-        """Create DailyTask records from plan tasks."""
-        week_start = plan.week_start
-        
-        for task_data in tasks:
-            day = task_data.get("day", 1)
-            task_date = week_start + timedelta(days=max(0, day - 1))
-            
-            task_type_str = task_data.get("type", "reading")
-            try:
-                task_type = TaskType(task_type_str)
-            except ValueError:
-                task_type = TaskType.READING
-            
-            daily_task = DailyTask(
-                plan_id=plan.id,
-                date=task_date,
-                task=task_data.get("task", ""),
-                timebox_min=task_data.get("timebox_min", 45),
-                task_type=task_type,
-                status=TaskStatus.PENDING,
-            )
-            self.db.add(daily_task)
-        
-        self.db.commit()
+    async def _create_daily_tasks(self, plan: Plan, tasks: List[Dict]):
+        """Create DailyTask records from plan tasks.
+
+        Inserts the whole week as one executemany instead of a per-task
+        ORM add, so a 7-14 task plan costs one round-trip rather than N.
+        """
+        rows = [self._task_row(plan.id, plan.week_start, t) for t in tasks]
+
+        if rows:
+            await self.db.execute(insert(DailyTask), rows)
+
+        await self.db.commit()
+
+    def _task_row(self, plan_id: int, week_start: date, task_data: Dict) -> Dict:
+        """Build a DailyTask insert row from one plan task dict."""
+        day = task_data.get("day", 1)
+
+        task_type_str = task_data.get("type", "reading")
+        try:
+            task_type = TaskType(task_type_str)
+        except ValueError:
+            task_type = TaskType.READING
+
+        return {
+            "plan_id": plan_id,
+            "date": week_start + timedelta(days=max(0, day - 1)),
+            "task": task_data.get("task", ""),
+            "timebox_min": task_data.get("timebox_min", 45),
+            "task_type": task_type,
+            "status": TaskStatus.PENDING,
+        }
     
     def _default_plan(self, commitment: Commitment) -> Dict:
         """Generate default plan if LLM fails."""
@@ -1,12 +1,16 @@
 """Premortem service for risk assessment."""
 
+import asyncio
 from typing import List, Optional
-from sqlalchemy.orm import Session
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from shared.llm import get_llm_provider, LLMProvider
 from shared.db.models import Commitment, PremortermRisk
 from shared.schemas import AgentDecision, Signals
 from shared.observability import get_logger, trace_function
+from app.core.llm_cache import cached_structured_output
+from app.core.templates import PromptTemplate
 
 logger = get_logger(__name__)
 
@@ -21,14 +25,9 @@ Your job is to:
 Focus on practical, concrete mitigations that the user can actually implement."""
 
 
-PREMORTEM_PROMPT_TEMPLATE = """The user's goal is: {goal}
-Timeline: {weeks_remaining} weeks
-Weekly hours: {weekly_hours}
-
-The user identified these potential reasons they might fail:
-{failure_reasons}
-
-For each risk, provide:
+# Static instructions first, user-specific fields last: keeps the shared
+# prefix identical across calls so provider-side prompt caching can reuse it
+PREMORTEM_PROMPT_TEMPLATE = """For each risk the user identifies, provide:
 1. A specific mitigation strategy
 2. A priority (1-5, where 1 is highest priority)
 
@@ -43,15 +42,31 @@ Respond in JSON format:
     ],
     "summary": "Brief summary of risk mitigation plan",
     "key_insight": "Most important insight about their risks"
-}}"""
+}}
+
+The user's goal is: {goal}
+Timeline: {weeks_remaining} weeks
+Weekly hours: {weekly_hours}
+
+The user identified these potential reasons they might fail:
+{failure_reasons}"""
+
+# Pre-split at import so per-request rendering is a join, not a format pass
+_PREMORTEM_TEMPLATE = PromptTemplate(PREMORTEM_PROMPT_TEMPLATE)
 
 
 class PremortermService:
     """Service for premortem risk assessment."""
     
-    def __init__(self, db: Session, llm: Optional[LLMProvider] = None):
+    def __init__(
+        self,
+        db: AsyncSession,
+        llm: Optional[LLMProvider] = None,
+        redis=None,
+    ):
         self.db = db
         self.llm = llm or get_llm_provider()
+        self.redis = redis
     
     @trace_function(name="process_premortem", tags=["premortem", "core-agent"])
     async def process_premortem(
@@ -71,10 +86,13 @@ class PremortermService:
         logger.info("Processing premortem", user_id=user_id, num_risks=len(failure_reasons))
         
         # Get active commitment
-        commitment = self.db.query(Commitment).filter(
-            Commitment.user_id == user_id,
-            Commitment.is_active == True
-        ).first()
+        result = await self.db.execute(
+            select(Commitment).where(
+                Commitment.user_id == user_id,
+                Commitment.is_active == True
+            )
+        )
+        commitment = result.scalars().first()
         
         if not commitment:
             return AgentDecision(
@@ -89,47 +107,58 @@ class PremortermService:
         
         # Calculate weeks remaining
         from datetime import date
-        weeks_remaining = (commitment.target_date - date.today()).days // 7
+        weeks_remaining = commitment.weeks_until_target(date.today())
         
         # Format failure reasons as numbered list
         reasons_text = "\n".join(f"{i+1}. {r}" for i, r in enumerate(failure_reasons[:5]))
         
-        # Get LLM analysis
-        try:
-            prompt = PREMORTEM_PROMPT_TEMPLATE.format(
-                goal=commitment.goal,
-                weeks_remaining=max(1, weeks_remaining),
-                weekly_hours=commitment.weekly_hours,
-                failure_reasons=reasons_text,
-            )
-            
-            llm_response = await self.llm.structured_output(
-                prompt=prompt,
-                schema={
-                    "type": "object",
-                    "properties": {
-                        "risks": {
-                            "type": "array",
-                            "items": {
-                                "type": "object",
-                                "properties": {
-                                    "risk": {"type": "string"},
-                                    "mitigation": {"type": "string"},
-                                    "priority": {"type": "integer"},
-                                },
+        # Kick off the LLM analysis, then clear the old risks while it is
+        # in flight: the delete is independent of the LLM output
+        prompt = _PREMORTEM_TEMPLATE.render(
+            goal=commitment.goal,
+            weeks_remaining=max(1, weeks_remaining),
+            weekly_hours=commitment.weekly_hours,
+            failure_reasons=reasons_text,
+        )
+        llm_task = asyncio.create_task(cached_structured_output(
+            self.llm,
+            self.redis,
+            prompt=prompt,
+            schema={
+                "type": "object",
+                "properties": {
+                    "risks": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "risk": {"type": "string"},
+                                "mitigation": {"type": "string"},
+                                "priority": {"type": "integer"},
                             },
                         },
-                        "summary": {"type": "string"},
-                        "key_insight": {"type": "string"},
                     },
-                    "required": ["risks", "summary"],
+                    "summary": {"type": "string"},
+                    "key_insight": {"type": "string"},
                 },
-                system_prompt=PREMORTEM_SYSTEM_PROMPT,
+                "required": ["risks", "summary"],
+            },
+            system_prompt=PREMORTEM_SYSTEM_PROMPT,
+        ))
+
+        await self.db.execute(
+            delete(PremortermRisk).where(
+                PremortermRisk.commitment_id == commitment.id
             )
-            
+        )
+
+        # Get LLM analysis
+        try:
+            llm_response = await llm_task
+
             risks = llm_response.get("risks", [])
             summary = llm_response.get("summary", "Risk assessment complete")
-            
+
         except Exception as e:
             logger.error("LLM call failed", error=str(e))
             # Fallback: create simple mitigations
@@ -138,22 +167,23 @@ class PremortermService:
                 for i, r in enumerate(failure_reasons[:5])
             ]
             summary = "Risk assessment complete. Consider these mitigations."
-        
-        # Clear existing risks and save new ones
-        self.db.query(PremortermRisk).filter(
-            PremortermRisk.commitment_id == commitment.id
-        ).delete()
-        
-        for risk_data in risks:
-            risk = PremortermRisk(
-                commitment_id=commitment.id,
-                risk=risk_data.get("risk", ""),
-                mitigation=risk_data.get("mitigation", ""),
-                priority=risk_data.get("priority", 5),
+
+        # Save new risks as one executemany instead of N ORM inserts
+        if risks:
+            await self.db.execute(
+                insert(PremortermRisk),
+                [
+                    {
+                        "commitment_id": commitment.id,
+                        "risk": risk_data.get("risk", ""),
+                        "mitigation": risk_data.get("mitigation", ""),
+                        "priority": risk_data.get("priority", 5),
+                    }
+                    for risk_data in risks
+                ],
             )
-            self.db.add(risk)
-        
-        self.db.commit()
+
+        await self.db.commit()
         
         # Build mitigation rules for response
         mitigation_rules = [r.get("mitigation", "")[:50] for r in risks[:3]]
@@ -179,8 +209,20 @@ class PremortermService:
             quality_flags=[],
         )
     
-    def get_risks(self, commitment_id: int) -> List[PremortermRisk]:
-        """Get all risks for a commitment."""
-        return self.db.query(PremortermRisk).filter(
-            PremortermRisk.commitment_id == commitment_id
-        ).order_by(PremortermRisk.priority).all()
+    async def get_risks(self, commitment_id: int) -> List:
+        """Get all risks for a commitment.
+
+        Returns named-tuple rows with just the display columns, skipping
+        full ORM instances for this read-only listing.
+        """
+        result = await self.db.execute(
+            select(
+                PremortermRisk.id,
+                PremortermRisk.risk,
+                PremortermRisk.mitigation,
+                PremortermRisk.priority,
+            )
+            .where(PremortermRisk.commitment_id == commitment_id)
+            .order_by(PremortermRisk.priority)
+        )
+        return result.all()
@@ -2,8 +2,8 @@
 
 from datetime import date, timedelta
 from typing import Dict, Optional
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import case, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from shared.db.models import (
     Commitment, Plan, DailyTask, Checkin, Quiz, ConceptMastery,
@@ -16,128 +16,155 @@ logger = get_logger(__name__)
 
 class ScoringService:
     """Service for calculating adherence, knowledge, and retention scores."""
-    
-    def __init__(self, db: Session):
+
+    def __init__(self, db: AsyncSession):
         self.db = db
-    
-    def calculate_adherence(self, user_id: int, days: int = 7) -> float:
+
+    async def calculate_adherence(self, user_id: int, days: int = 7) -> float:
         """Calculate task completion adherence score.
-        
+
         Args:
             user_id: User ID
             days: Number of days to consider
-            
+
         Returns:
             Adherence score between 0.0 and 1.0
         """
         since = date.today() - timedelta(days=days)
-        
+
         # Get active plan
-        plan = self.db.query(Plan).filter(
-            Plan.user_id == user_id,
-            Plan.is_active == True
-        ).first()
-        
+        result = await self.db.execute(
+            select(Plan).where(
+                Plan.user_id == user_id,
+                Plan.is_active == True
+            )
+        )
+        plan = result.scalars().first()
+
         if not plan:
             return 0.0
-        
-        # Count tasks
-        total_tasks = self.db.query(DailyTask).filter(
-            DailyTask.plan_id == plan.id,
-            DailyTask.date >= since,
-            DailyTask.date <= date.today(),
-        ).count()
-        
-        completed_tasks = self.db.query(DailyTask).filter(
-            DailyTask.plan_id == plan.id,
-            DailyTask.date >= since,
-            DailyTask.date <= date.today(),
-            DailyTask.status == TaskStatus.COMPLETED,
-        ).count()
-        
+
+        # Count total and completed tasks in one round-trip via a
+        # conditional aggregate instead of two near-identical COUNT queries
+        result = await self.db.execute(
+            select(
+                func.count(),
+                func.coalesce(
+                    func.sum(case((DailyTask.status == TaskStatus.COMPLETED, 1), else_=0)),
+                    0,
+                ),
+            ).select_from(DailyTask).where(
+                DailyTask.plan_id == plan.id,
+                DailyTask.date >= since,
+                DailyTask.date <= date.today(),
+            )
+        )
+        total_tasks, completed_tasks = result.one()
+
         if total_tasks == 0:
             return 1.0  # No tasks to complete
-        
+
         return round(completed_tasks / total_tasks, 2)
-    
-    def calculate_knowledge(self, user_id: int) -> float:
+
+    async def calculate_knowledge(self, user_id: int) -> float:
         """Calculate knowledge score from quiz performance.
-        
+
         Args:
             user_id: User ID
-            
+
         Returns:
             Knowledge score between 0.0 and 1.0
         """
-        # Get completed quizzes
-        quizzes = self.db.query(Quiz).filter(
-            Quiz.user_id == user_id,
-            Quiz.completed == True,
-            Quiz.score is not None,
-        ).order_by(Quiz.created_at.desc()).limit(5).all()
-        
-        if not quizzes:
+        # Average the 5 most recent scored quizzes DB-side. Note
+        # Quiz.score.isnot(None): a plain `is not None` evaluates to the
+        # Python True at construction time and filters nothing
+        recent = (
+            select(Quiz.score)
+            .where(
+                Quiz.user_id == user_id,
+                Quiz.completed == True,
+                Quiz.score.isnot(None),
+            )
+            .order_by(Quiz.created_at.desc())
+            .limit(5)
+            .subquery()
+        )
+        result = await self.db.execute(select(func.avg(recent.c.score)))
+        avg_score = result.scalar_one()
+
+        if avg_score is None:
             return 0.0
-        
-        avg_score = sum(q.score or 0 for q in quizzes) / len(quizzes)
+
         return round(avg_score, 2)
-    
-    def calculate_retention(self, user_id: int) -> float:
+
+    async def calculate_retention(self, user_id: int) -> float:
         """Calculate retention score from concept mastery.
-        
+
         Args:
             user_id: User ID
-            
+
         Returns:
             Retention score between 0.0 and 1.0
         """
-        # Get concept mastery records
-        concepts = self.db.query(ConceptMastery).filter(
-            ConceptMastery.user_id == user_id,
-        ).all()
-        
-        if not concepts:
-            return 0.0
-        
-        # Calculate weighted retention
-        total_seen = sum(c.times_seen for c in concepts)
-        total_correct = sum(c.times_correct for c in concepts)
-        
+        # Sum DB-side instead of materializing every ConceptMastery row
+        # just to add up two integer columns
+        result = await self.db.execute(
+            select(
+                func.coalesce(func.sum(ConceptMastery.times_seen), 0),
+                func.coalesce(func.sum(ConceptMastery.times_correct), 0),
+            ).where(ConceptMastery.user_id == user_id)
+        )
+        total_seen, total_correct = result.one()
+
         if total_seen == 0:
             return 0.0
-        
+
         return round(total_correct / total_seen, 2)
-    
+
     def calculate_recovery_effectiveness(self, user_id: int) -> float:
         """Calculate how well user recovers from at_risk status.
-        
+
         Args:
             user_id: User ID
-            
+
         Returns:
             Recovery score between 0.0 and 1.0
         """
         # This would analyze historical status changes
         # For now, return a static value
         return 0.8
-    
-    def get_user_status(self, user_id: int) -> str:
+
+    async def get_user_status(
+        self,
+        user_id: int,
+        adherence: Optional[float] = None,
+        recent_checkins: Optional[int] = None,
+    ) -> str:
         """Determine current user status based on metrics.
-        
+
+        Callers that already computed the inputs (get_full_metrics fetches
+        both in its fused query) pass them in so no extra queries fire.
+
         Args:
             user_id: User ID
-            
+            adherence: Precomputed adherence score, if available
+            recent_checkins: Precomputed 3-day check-in count, if available
+
         Returns:
             Status string: 'active', 'at_risk', or 'recovering'
         """
-        adherence = self.calculate_adherence(user_id)
-        
-        # Check recent check-ins
-        recent_checkins = self.db.query(Checkin).filter(
-            Checkin.user_id == user_id,
-            Checkin.date >= date.today() - timedelta(days=3),
-        ).count()
-        
+        if adherence is None:
+            adherence = await self.calculate_adherence(user_id)
+
+        if recent_checkins is None:
+            result = await self.db.execute(
+                select(func.count()).select_from(Checkin).where(
+                    Checkin.user_id == user_id,
+                    Checkin.date >= date.today() - timedelta(days=3),
+                )
+            )
+            recent_checkins = result.scalar_one()
+
         # Status logic
         if adherence < 0.3 or recent_checkins == 0:
             return "at_risk"
@@ -145,35 +172,149 @@ class ScoringService:
             return "recovering"
         else:
             return "active"
-    
-    def get_full_metrics(self, user_id: int) -> Dict:
+
+    async def get_full_metrics(self, user_id: int) -> Dict:
         """Get all metrics for a user.
-        
+
+        Fetches every input as a scalar subquery of one SELECT, so the
+        dashboard costs a single round-trip instead of the 6-8 it took when
+        each calculate_* helper ran its own queries.
+
         Args:
             user_id: User ID
-            
+
         Returns:
             Dictionary with all metrics
         """
-        adherence = self.calculate_adherence(user_id)
-        knowledge = self.calculate_knowledge(user_id)
-        retention = self.calculate_retention(user_id)
+        today = date.today()
+        since = today - timedelta(days=7)
+
+        active_plan_id = (
+            select(Plan.id)
+            .where(Plan.user_id == user_id, Plan.is_active == True)
+            .limit(1)
+            .scalar_subquery()
+        )
+        plan_count_sq = (
+            select(func.count())
+            .select_from(Plan)
+            .where(Plan.user_id == user_id, Plan.is_active == True)
+            .scalar_subquery()
+        )
+        total_tasks_sq = (
+            select(func.count())
+            .select_from(DailyTask)
+            .where(
+                DailyTask.plan_id == active_plan_id,
+                DailyTask.date >= since,
+                DailyTask.date <= today,
+            )
+            .scalar_subquery()
+        )
+        completed_tasks_sq = (
+            select(func.coalesce(
+                func.sum(case((DailyTask.status == TaskStatus.COMPLETED, 1), else_=0)), 0
+            ))
+            .where(
+                DailyTask.plan_id == active_plan_id,
+                DailyTask.date >= since,
+                DailyTask.date <= today,
+            )
+            .scalar_subquery()
+        )
+        recent_quizzes = (
+            select(Quiz.score)
+            .where(
+                Quiz.user_id == user_id,
+                Quiz.completed == True,
+                Quiz.score.isnot(None),
+            )
+            .order_by(Quiz.created_at.desc())
+            .limit(5)
+            .subquery()
+        )
+        quiz_avg_sq = select(func.avg(recent_quizzes.c.score)).scalar_subquery()
+        seen_sq = (
+            select(func.coalesce(func.sum(ConceptMastery.times_seen), 0))
+            .where(ConceptMastery.user_id == user_id)
+            .scalar_subquery()
+        )
+        correct_sq = (
+            select(func.coalesce(func.sum(ConceptMastery.times_correct), 0))
+            .where(ConceptMastery.user_id == user_id)
+            .scalar_subquery()
+        )
+        checkins_sq = (
+            select(func.count())
+            .select_from(Checkin)
+            .where(Checkin.user_id == user_id, Checkin.date >= today - timedelta(days=3))
+            .scalar_subquery()
+        )
+        created_at_sq = (
+            select(Commitment.created_at)
+            .where(Commitment.user_id == user_id, Commitment.is_active == True)
+            .limit(1)
+            .scalar_subquery()
+        )
+        target_date_sq = (
+            select(Commitment.target_date)
+            .where(Commitment.user_id == user_id, Commitment.is_active == True)
+            .limit(1)
+            .scalar_subquery()
+        )
+
+        (
+            plan_count,
+            total_tasks,
+            completed_tasks,
+            quiz_avg,
+            total_seen,
+            total_correct,
+            recent_checkins,
+            commitment_created,
+            commitment_target,
+        ) = (
+            await self.db.execute(
+                select(
+                    plan_count_sq,
+                    total_tasks_sq,
+                    completed_tasks_sq,
+                    quiz_avg_sq,
+                    seen_sq,
+                    correct_sq,
+                    checkins_sq,
+                    created_at_sq,
+                    target_date_sq,
+                )
+            )
+        ).one()
+
+        # Derive scores in Python, mirroring the calculate_* helpers
+        if plan_count == 0:
+            adherence = 0.0
+        elif total_tasks == 0:
+            adherence = 1.0
+        else:
+            adherence = round(completed_tasks / total_tasks, 2)
+
+        knowledge = round(quiz_avg, 2) if quiz_avg is not None else 0.0
+        retention = round(total_correct / total_seen, 2) if total_seen else 0.0
         recovery = self.calculate_recovery_effectiveness(user_id)
-        status = self.get_user_status(user_id)
-        
-        # Get current week
-        commitment = self.db.query(Commitment).filter(
-            Commitment.user_id == user_id,
-            Commitment.is_active == True
-        ).first()
-        
+
+        # Status reuses the already-fetched adherence and check-in count
+        # instead of re-querying
+        status = await self.get_user_status(
+            user_id, adherence=adherence, recent_checkins=recent_checkins
+        )
+
         current_week = 1
         weeks_remaining = 4
-        
-        if commitment:
-            current_week = max(1, (date.today() - commitment.created_at.date()).days // 7 + 1)
-            weeks_remaining = max(0, (commitment.target_date - date.today()).days // 7)
-        
+
+        if commitment_created is not None:
+            today_ord = today.toordinal()
+            current_week = max(1, (today_ord - commitment_created.toordinal()) // 7 + 1)
+            weeks_remaining = max(0, (commitment_target.toordinal() - today_ord) // 7)
+
         return {
             "adherence_score": adherence,
             "knowledge_score": knowledge,
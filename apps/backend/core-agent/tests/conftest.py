@@ -1,23 +1,74 @@
 """Test configuration and fixtures."""
 
 import pytest
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 
 from shared.db.base import Base
+import shared.db.models  # noqa: F401  -- registers tables on Base.metadata
 
 
-@pytest.fixture(scope="function")
-def db_session():
-    """Create an in-memory database session for testing."""
-    engine = create_engine("sqlite:///:memory:")
+@pytest.fixture(scope="session")
+def worker_id(request):
+    """Identify the current pytest-xdist worker ("master" without xdist).
+
+    xdist ships its own worker_id fixture which shadows this one when the
+    plugin is active; this fallback keeps plain pytest runs working.
+    """
+    return getattr(request.config, "workerinput", {}).get("workerid", "master")
+
+
+@pytest.fixture(scope="session")
+def engine(worker_id):
+    """Shared in-memory engine; the schema is created once per run.
+
+    The shared-cache URI gives each xdist worker its own named in-memory
+    database, so parallel workers never contend on one connection.
+    """
+    engine = create_engine(
+        f"sqlite:///file:memdb_{worker_id}?mode=memory&cache=shared&uri=true",
+        connect_args={"uri": True, "check_same_thread": False},
+        poolclass=StaticPool,
+    )
+
+    # pysqlite's default transaction handling breaks SAVEPOINTs; take over
+    # BEGIN emission so the nested-transaction rollback below works
+    @event.listens_for(engine, "connect")
+    def _do_connect(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _do_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
     Base.metadata.create_all(bind=engine)
-    
-    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture(scope="function")
+def db_session(engine):
+    """Create a transactional database session for testing.
+
+    Each test runs inside an outer transaction; commits inside the test
+    only release savepoints, and teardown is a single rollback instead of
+    a per-test drop_all/create_all cycle.
+    """
+    connection = engine.connect()
+    transaction = connection.begin()
+
+    SessionLocal = sessionmaker(
+        autocommit=False,
+        autoflush=False,
+        bind=connection,
+        join_transaction_mode="create_savepoint",
+    )
     session = SessionLocal()
-    
+
     try:
         yield session
     finally:
         session.close()
-        Base.metadata.drop_all(bind=engine)
+        transaction.rollback()
+        connection.close()
@@ -0,0 +1,87 @@
+"""Regression tests for the plan-generation LLM-failure fallback."""
+
+import asyncio
+from datetime import date, timedelta
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from shared.db.base import Base
+from shared.db.models import Commitment, Plan, User
+
+from app.services.plan_service import PlanService
+
+
+class MidStreamFailingLLM:
+    """Stub provider whose plan stream dies after the first task."""
+
+    async def structured_output_stream(self, prompt, schema, array_field, **kwargs):
+        yield ("item", {"task": "Partial task", "timebox_min": 45, "type": "reading", "day": 1})
+        raise RuntimeError("stream interrupted")
+
+
+async def _run_fallback_scenario():
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    # Mirror production session config: rollback still expires everything
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    async with session_factory() as db:
+        today = date.today()
+        week_start = today - timedelta(days=today.weekday())
+        user = User(email="fallback@example.com")
+        db.add(user)
+        await db.flush()
+        db.add(Commitment(
+            user_id=user.id,
+            goal="Learn SQL",
+            target_date=date.today() + timedelta(weeks=8),
+            weekly_hours=5,
+        ))
+        db.add(Plan(
+            user_id=user.id,
+            week_start=week_start,
+            version=1,
+            plan_json={"week_focus": "old", "tasks": []},
+            is_active=True,
+        ))
+        await db.commit()
+
+        service = PlanService(db, llm=MidStreamFailingLLM())
+        decision = await service.generate_weekly_plan(user.id, force_regenerate=True)
+
+        plans = (
+            (await db.execute(select(Plan).order_by(Plan.version)))
+            .scalars()
+            .all()
+        )
+
+    await engine.dispose()
+    return decision, plans
+
+
+class TestPlanFallback:
+    """LLM failures must degrade to the default plan, not a 500."""
+
+    def test_mid_stream_failure_falls_back_over_existing_plan(self):
+        """A stream that dies mid-plan still replaces the active plan.
+
+        The rollback after the failed stream expires the loaded ORM rows;
+        reading them without a refresh raises MissingGreenlet instead of
+        returning the default plan.
+        """
+        decision, plans = asyncio.run(_run_fallback_scenario())
+
+        assert decision.reason.startswith("Week 2:")
+        assert "Getting started with Learn SQL" in decision.reason
+        assert len(decision.next_tasks) == 3
+
+        # Old plan deactivated, fallback plan stored as the next version;
+        # the half-written streamed plan row was rolled back
+        assert len(plans) == 2
+        old, new = plans
+        assert (old.version, old.is_active) == (1, False)
+        assert (new.version, new.is_active) == (2, True)
+        assert new.plan_json["week_focus"] == "Getting started with Learn SQL"
@@ -1,36 +1,48 @@
 """Evaluator configuration."""
 
+import os
+
 from pydantic_settings import BaseSettings
 from functools import lru_cache
 
 
 class Settings(BaseSettings):
     """Evaluator service settings."""
-    
+
     ENVIRONMENT: str = "development"
     DEBUG: bool = True
     LOG_LEVEL: str = "INFO"
-    
+
     EVALUATOR_PORT: int = 8003
     DATABASE_URL: str = "sqlite:///./dev.db"
-    
+
+    # Redis backs the judge-verdict and semantic LLM caches; leaving the
+    # URL unset runs the service with those caches disabled
+    REDIS_URL: str = ""
+
     # LLM
     LLM_PROVIDER: str = "openai"
     OPENAI_API_KEY: str = ""
     OPENAI_MODEL: str = "gpt-4o"
-    
+    EMBEDDING_MODEL: str = "text-embedding-3-small"
+    LLM_MAX_CONCURRENCY: int = 8
+
     # Code sandbox (for future implementation)
     SANDBOX_ENABLED: bool = False
     SANDBOX_TIMEOUT_SECONDS: int = 10
-    
+    SANDBOX_WORKERS: int = 2
+    SANDBOX_MEMORY_MB: int = 256
+
     class Config:
-        env_file = ".env"
+        # Tests set EVALUATOR_TEST_MODE=1 to skip .env parsing so a
+        # developer's local file cannot leak into test runs
+        env_file = None if os.getenv("EVALUATOR_TEST_MODE") == "1" else ".env"
         extra = "ignore"
+        frozen = True
 
 
 @lru_cache
 def get_settings() -> Settings:
+    """Cached settings factory; import this instead of a module-level
+    instance so merely importing config never touches the environment."""
     return Settings()
-
-
-settings = get_settings()
@@ -1,15 +1,22 @@
 """Evaluator API - Main Application."""
 
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, Depends, Header
+import orjson
+from fastapi import FastAPI, Depends, Header, Request
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.orm import Session
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from redis.asyncio import Redis
+from sqlalchemy import Float, cast, func, select
+from sqlalchemy.orm import Session, selectinload
 from pydantic import BaseModel
 from typing import Optional, List
 
+from shared.llm import OpenAIEmbeddingClient, SemanticLLMCache, aclose_llm_providers
 from shared.observability import RequestIdMiddleware, setup_logging, get_logger
 from shared.db import get_session
-from app.core.config import settings
+from app.core.config import get_settings
+
+settings = get_settings()
 from app.services import QuizService, CodingService
 
 
@@ -20,7 +27,28 @@ logger = get_logger(__name__)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("Evaluator service starting", port=settings.EVALUATOR_PORT)
+    # Judge-verdict cache storage; without a REDIS_URL the service runs
+    # with caching disabled and every answer goes to the LLM judge
+    app.state.redis = Redis.from_url(settings.REDIS_URL) if settings.REDIS_URL else None
+    # Semantic cache over structured-output calls: needs Redis for
+    # storage and an OpenAI key for prompt embeddings
+    app.state.embedding_client = None
+    app.state.semcache = None
+    if app.state.redis is not None and settings.OPENAI_API_KEY:
+        app.state.embedding_client = OpenAIEmbeddingClient(
+            api_key=settings.OPENAI_API_KEY,
+            model=settings.EMBEDDING_MODEL,
+        )
+        app.state.semcache = SemanticLLMCache(
+            embedding_client=app.state.embedding_client,
+            redis=app.state.redis,
+        )
     yield
+    await aclose_llm_providers()
+    if app.state.embedding_client is not None:
+        await app.state.embedding_client.aclose()
+    if app.state.redis is not None:
+        await app.state.redis.aclose()
     logger.info("Evaluator service shutting down")
 
 
@@ -29,6 +57,7 @@ app = FastAPI(
     description="Quiz, coding challenges, and LLM judge",
     version="0.1.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 app.add_middleware(RequestIdMiddleware)
@@ -64,17 +93,31 @@ class CodeSubmitRequest(BaseModel):
     code: str
 
 
-# Dependency
-def get_user_id(x_user_id: Optional[str] = Header(None)) -> int:
-    if not x_user_id:
-        return 1
-    return int(x_user_id)
+# Dependencies
+def get_user_id(x_user_id: Optional[int] = Header(None)) -> int:
+    # Pydantic's compiled validator parses the int for us
+    return x_user_id or 1
+
+
+def get_redis(request: Request) -> Optional[Redis]:
+    """Get the app-lifetime Redis client, or None when unconfigured."""
+    return request.app.state.redis
+
+
+def get_semcache(request: Request) -> Optional[SemanticLLMCache]:
+    """Get the semantic LLM cache, or None when Redis or the API key is unset."""
+    return request.app.state.semcache
 
 
 # Routes
-@app.get("/health")
+# Probes hit this endpoint constantly; serve a prebuilt payload and keep
+# it out of the OpenAPI schema
+_HEALTH = {"status": "healthy", "service": "evaluator"}
+
+
+@app.get("/health", include_in_schema=False, response_class=ORJSONResponse)
 async def health_check():
-    return {"status": "healthy", "service": "evaluator"}
+    return _HEALTH
 
 
 @app.post("/v1/eval/quiz/generate")
@@ -82,9 +125,11 @@ async def generate_quiz(
     request: QuizGenerateRequest,
     db: Session = Depends(get_session),
     user_id: int = Depends(get_user_id),
+    redis: Optional[Redis] = Depends(get_redis),
+    semcache: Optional[SemanticLLMCache] = Depends(get_semcache),
 ):
     """Generate a quiz for the given topic."""
-    service = QuizService(db)
+    service = QuizService(db, semcache=semcache, redis=redis)
     return await service.generate_quiz(
         user_id=user_id,
         topic=request.topic,
@@ -97,9 +142,11 @@ async def generate_quiz(
 async def submit_quiz(
     request: QuizSubmitRequest,
     db: Session = Depends(get_session),
+    redis: Optional[Redis] = Depends(get_redis),
+    semcache: Optional[SemanticLLMCache] = Depends(get_semcache),
 ):
     """Submit quiz answers for grading."""
-    service = QuizService(db)
+    service = QuizService(db, semcache=semcache, redis=redis)
     return await service.submit_quiz(
         quiz_id=request.quiz_id,
         answers=request.answers,
@@ -112,16 +159,18 @@ async def get_quiz(
     db: Session = Depends(get_session),
 ):
     """Get quiz details."""
-    from shared.db.models import Quiz, QuizQuestion
-    
-    quiz = db.query(Quiz).filter(Quiz.id == quiz_id).first()
+    from shared.db.models import Quiz
+
+    # Eager-load questions with the quiz: one round-trip instead of two
+    quiz = (
+        db.query(Quiz)
+        .options(selectinload(Quiz.questions))
+        .filter(Quiz.id == quiz_id)
+        .first()
+    )
     if not quiz:
         return {"error": "Quiz not found"}
-    
-    questions = db.query(QuizQuestion).filter(
-        QuizQuestion.quiz_id == quiz_id
-    ).all()
-    
+
     return {
         "quiz_id": quiz.id,
         "topic": quiz.topic,
@@ -134,7 +183,7 @@ async def get_quiz(
                 "type": q.question_type.value,
                 "options": q.options,
             }
-            for q in questions
+            for q in quiz.questions
         ],
     }
 
@@ -197,22 +246,42 @@ async def get_retention_data(
 ):
     """Get concept mastery/retention data for a user."""
     from shared.db.models import ConceptMastery
-    
-    concepts = db.query(ConceptMastery).filter(
-        ConceptMastery.user_id == user_id
-    ).order_by(ConceptMastery.times_seen.desc()).all()
-    
-    return {
-        "user_id": user_id,
-        "concepts": [
-            {
-                "concept": c.concept,
-                "times_seen": c.times_seen,
-                "times_correct": c.times_correct,
-                "times_wrong": c.times_wrong,
-                "mastery": c.times_correct / c.times_seen if c.times_seen > 0 else 0,
-                "next_review": c.next_review_at.isoformat() if c.next_review_at else None,
+
+    # Mastery is computed in SQL and rows are streamed in batches instead
+    # of materializing every ConceptMastery instance; the payload shape is
+    # unchanged, it is just rendered incrementally
+    rows = db.execute(
+        select(
+            ConceptMastery.concept,
+            ConceptMastery.times_seen,
+            ConceptMastery.times_correct,
+            ConceptMastery.times_wrong,
+            (
+                cast(ConceptMastery.times_correct, Float)
+                / func.nullif(ConceptMastery.times_seen, 0)
+            ).label("mastery"),
+            ConceptMastery.next_review_at,
+        )
+        .where(ConceptMastery.user_id == user_id)
+        .order_by(ConceptMastery.times_seen.desc())
+    ).yield_per(500)
+
+    def render():
+        yield f'{{"user_id": {user_id}, "concepts": ['
+        first = True
+        for row in rows:
+            item = {
+                "concept": row.concept,
+                "times_seen": row.times_seen,
+                "times_correct": row.times_correct,
+                "times_wrong": row.times_wrong,
+                "mastery": row.mastery if row.mastery is not None else 0,
+                # orjson serializes the datetime directly; no isoformat pass
+                "next_review": row.next_review_at,
             }
-            for c in concepts
-        ],
-    }
+            encoded = orjson.dumps(item, option=orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z)
+            yield (b"" if first else b",") + encoded
+            first = False
+        yield b"]}"
+
+    return StreamingResponse(render(), media_type="application/json")
@@ -1,18 +1,144 @@
 """Coding challenge service."""
 
-import subprocess
-import tempfile
-import os
+import asyncio
+import hashlib
+import json
+import multiprocessing
+import resource
+import signal
+import sys
+import threading
+from types import CodeType
+
+import orjson
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
 from typing import List, Optional, Dict
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 
 from shared.llm import get_llm_provider, LLMProvider
 from shared.db.models import CodingChallenge, CodeSubmission
 from shared.observability import get_logger
-from app.core.config import settings
+from app.core.config import get_settings
 
 logger = get_logger(__name__)
 
+_MB = 1024 * 1024
+
+
+# Per-case CPU budget inside a worker; set by _sandbox_worker_init
+_case_cpu_seconds = 2.0
+
+
+def _case_timeout_handler(signum, frame):
+    raise TimeoutError("Test case exceeded CPU time limit")
+
+
+def _sandbox_worker_init(cpu_seconds: int, memory_mb: int):
+    """Apply CPU/memory rlimits in each sandbox worker process.
+
+    RLIMIT_CPU is the hard backstop for the whole submission; the virtual
+    interval timer in _run_user_code bounds each individual test case so
+    one runaway case raises TimeoutError instead of killing the worker.
+    """
+    global _case_cpu_seconds
+    resource.setrlimit(resource.RLIMIT_CPU, (cpu_seconds, cpu_seconds))
+    resource.setrlimit(resource.RLIMIT_AS, (memory_mb * _MB, memory_mb * _MB))
+    signal.signal(signal.SIGVTALRM, _case_timeout_handler)
+    _case_cpu_seconds = max(cpu_seconds / 4, 0.5)
+
+
+# Identical code is resubmitted constantly during iterative development;
+# cache compiled code objects by content hash so retries skip the parse
+_COMPILED_LRU: "OrderedDict[bytes, CodeType]" = OrderedDict()
+_COMPILED_LRU_MAXSIZE = 512
+_compiled_lru_lock = threading.Lock()
+
+
+def _compile_cached(code: str) -> CodeType:
+    """Compile source through a bounded LRU keyed by a blake2b digest."""
+    key = hashlib.blake2b(code.encode(), digest_size=16).digest()
+    with _compiled_lru_lock:
+        cached = _COMPILED_LRU.get(key)
+        if cached is not None:
+            _COMPILED_LRU.move_to_end(key)
+            return cached
+
+    compiled = compile(code, "<submission>", "exec")
+
+    with _compiled_lru_lock:
+        _COMPILED_LRU[key] = compiled
+        if len(_COMPILED_LRU) > _COMPILED_LRU_MAXSIZE:
+            _COMPILED_LRU.popitem(last=False)
+    return compiled
+
+
+def _run_user_code(code: str, test_inputs: List[str]) -> List[Dict]:
+    """Run a submission against all test inputs inside a pool worker.
+
+    The source is compiled and exec'd once per submission, then solution()
+    is called per case, so interpreter startup and parsing are paid once
+    per submission rather than once per test case.
+    """
+    try:
+        compiled = _compile_cached(code)
+        namespace: Dict = {}
+        exec(compiled, namespace)
+        solution = namespace.get("solution")
+        if not callable(solution):
+            return [{"error": "No solution() function defined"} for _ in test_inputs]
+    except Exception as e:
+        return [{"error": str(e)} for _ in test_inputs]
+
+    results = []
+    for test_input in test_inputs:
+        try:
+            # ITIMER_VIRTUAL counts CPU time, so a case that spins burns
+            # its own budget without charging time spent waiting
+            signal.setitimer(signal.ITIMER_VIRTUAL, _case_cpu_seconds)
+            try:
+                value = solution(eval(test_input))
+            finally:
+                signal.setitimer(signal.ITIMER_VIRTUAL, 0)
+            results.append({"output": str(value)})
+        except Exception as e:
+            results.append({"error": str(e)})
+    return results
+
+
+# Appended to the submission to drive every test case through one process:
+# inputs arrive as newline-delimited JSON on stdin, one result line each
+_SANDBOX_DRIVER_FOOTER = """
+import json as _json, sys as _sys
+for _line in _sys.stdin:
+    _tc = _json.loads(_line)
+    try:
+        print(_json.dumps({"output": str(solution(eval(_tc["input"])))}))
+    except Exception as _e:
+        print(_json.dumps({"error": str(_e)}))
+"""
+
+
+# Shared pre-forked worker pool: spawning python3 per test case pays
+# ~30-80ms of interpreter startup before any user code runs
+_sandbox_pool = None
+
+
+def _get_sandbox_pool():
+    """Lazily create the shared sandbox worker pool."""
+    global _sandbox_pool
+    if _sandbox_pool is None:
+        settings = get_settings()
+        ctx = multiprocessing.get_context("forkserver")
+        _sandbox_pool = ctx.Pool(
+            processes=settings.SANDBOX_WORKERS,
+            initializer=_sandbox_worker_init,
+            initargs=(settings.SANDBOX_TIMEOUT_SECONDS, settings.SANDBOX_MEMORY_MB),
+        )
+    return _sandbox_pool
+
 
 CHALLENGE_GENERATION_PROMPT = """Create a coding challenge for: {topic}
 Difficulty: {difficulty}
@@ -35,13 +161,95 @@ Respond in JSON format:
     "solution": "def solution(input):\\n    # Reference solution\\n    return result"
 }}"""
 
+# Constant parts of the fallback challenge, built once instead of per LLM
+# failure (which tends to arrive in storms)
+_DEFAULT_STARTER_CODE = "def solution(x):\n    # Your code here\n    pass"
+_DEFAULT_SOLUTION = "def solution(x):\n    return x"
+_DEFAULT_TEST_CASES = (
+    {"input": "1", "expected": "1"},
+    {"input": "2", "expected": "2"},
+)
+
+# Built once: the schema is identical for every generate_challenge call
+_CHALLENGE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "title": {"type": "string"},
+        "problem": {"type": "string"},
+        "starter_code": {"type": "string"},
+        "test_cases": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "input": {"type": "string"},
+                    "expected": {"type": "string"},
+                },
+            },
+        },
+        "solution": {"type": "string"},
+    },
+    "required": ["title", "problem", "test_cases"],
+}
+
+
+@dataclass(frozen=True, slots=True)
+class ChallengeView:
+    """Immutable, session-detached copy of a challenge's hot fields."""
+
+    id: int
+    title: str
+    problem: str
+    language: str
+    difficulty: str
+    starter_code: Optional[str]
+    test_cases: List[Dict]
+    solution: Optional[str]
+    concept: Optional[str]
+
+
+# Challenges never mutate once generated, so reads can be served from a
+# bounded LRU of detached views instead of a SELECT per lookup
+_CHALLENGE_CACHE: "OrderedDict[int, ChallengeView]" = OrderedDict()
+_CHALLENGE_CACHE_MAXSIZE = 2048
+_challenge_cache_lock = threading.Lock()
+
+
+def _cache_challenge(view: ChallengeView) -> None:
+    """Insert a view into the LRU, evicting the oldest entry when full."""
+    with _challenge_cache_lock:
+        _CHALLENGE_CACHE[view.id] = view
+        if len(_CHALLENGE_CACHE) > _CHALLENGE_CACHE_MAXSIZE:
+            _CHALLENGE_CACHE.popitem(last=False)
+
+
+@lru_cache(maxsize=1024)
+def _render_challenge_prompt(topic: str, difficulty: str, language: str) -> str:
+    """Render the generation prompt; repeat triples hit the cache."""
+    return CHALLENGE_GENERATION_PROMPT.format(
+        topic=topic,
+        difficulty=difficulty,
+        language=language,
+    )
+
 
 class CodingService:
     """Service for coding challenges and evaluation."""
     
     def __init__(self, db: Session, llm: Optional[LLMProvider] = None):
         self.db = db
-        self.llm = llm or get_llm_provider()
+        self._llm = llm
+
+    @property
+    def llm(self) -> LLMProvider:
+        """LLM provider, constructed on first use.
+
+        get_challenge and submissions never touch the LLM, so those
+        requests skip provider construction entirely.
+        """
+        if self._llm is None:
+            self._llm = get_llm_provider()
+        return self._llm
     
     async def generate_challenge(
         self,
@@ -65,64 +273,41 @@ class CodingService:
         
         # Generate with LLM
         try:
-            prompt = CHALLENGE_GENERATION_PROMPT.format(
-                topic=topic,
-                difficulty=difficulty,
-                language=language,
-            )
-            
             llm_response = await self.llm.structured_output(
-                prompt=prompt,
-                schema={
-                    "type": "object",
-                    "properties": {
-                        "title": {"type": "string"},
-                        "problem": {"type": "string"},
-                        "starter_code": {"type": "string"},
-                        "test_cases": {
-                            "type": "array",
-                            "items": {
-                                "type": "object",
-                                "properties": {
-                                    "input": {"type": "string"},
-                                    "expected": {"type": "string"},
-                                },
-                            },
-                        },
-                        "solution": {"type": "string"},
-                    },
-                    "required": ["title", "problem", "test_cases"],
-                },
+                prompt=_render_challenge_prompt(topic, difficulty, language),
+                schema=_CHALLENGE_SCHEMA,
             )
-            
+
         except Exception as e:
             logger.error("LLM challenge generation failed", error=str(e))
             llm_response = self._default_challenge(topic, language)
         
-        # Create challenge record
-        challenge = CodingChallenge(
-            user_id=user_id,
-            title=llm_response.get("title", f"Challenge: {topic}"),
-            problem=llm_response.get("problem", ""),
-            language=language,
-            difficulty=difficulty,
-            starter_code=llm_response.get("starter_code"),
-            test_cases=llm_response.get("test_cases", []),
-            solution=llm_response.get("solution"),
-            concept=topic,
-        )
-        self.db.add(challenge)
+        # Create challenge record; RETURNING hands back the PK in the same
+        # statement, skipping the post-commit refresh SELECT
+        values = {
+            "user_id": user_id,
+            "title": llm_response.get("title", f"Challenge: {topic}"),
+            "problem": llm_response.get("problem", ""),
+            "language": language,
+            "difficulty": difficulty,
+            "starter_code": llm_response.get("starter_code"),
+            "test_cases": llm_response.get("test_cases", []),
+            "solution": llm_response.get("solution"),
+            "concept": topic,
+        }
+        challenge_id = self.db.execute(
+            insert(CodingChallenge).values(**values).returning(CodingChallenge.id)
+        ).scalar_one()
         self.db.commit()
-        self.db.refresh(challenge)
-        
+
         return {
-            "challenge_id": challenge.id,
-            "title": challenge.title,
-            "problem": challenge.problem,
-            "language": challenge.language,
-            "difficulty": challenge.difficulty,
-            "starter_code": challenge.starter_code,
-            "test_cases_count": len(challenge.test_cases),
+            "challenge_id": challenge_id,
+            "title": values["title"],
+            "problem": values["problem"],
+            "language": language,
+            "difficulty": difficulty,
+            "starter_code": values["starter_code"],
+            "test_cases_count": len(values["test_cases"]),
         }
     
     async def submit_code(
@@ -141,10 +326,8 @@ class CodingService:
         """
         logger.info("Evaluating code submission", challenge_id=challenge_id)
         
-        challenge = self.db.query(CodingChallenge).filter(
-            CodingChallenge.id == challenge_id
-        ).first()
-        
+        challenge = self.get_challenge(challenge_id)
+
         if not challenge:
             return {"error": "Challenge not found"}
         
@@ -155,27 +338,18 @@ class CodingService:
         error_output = None
         
         # Execute code against test cases (sandboxed)
-        if settings.SANDBOX_ENABLED:
-            for tc in test_cases:
-                try:
-                    result = await self._execute_sandbox(
-                        code=code,
-                        test_input=tc.get("input"),
-                        expected=tc.get("expected"),
-                        language=challenge.language,
-                    )
-                    if result["passed"]:
-                        passed += 1
-                    results.append(result)
-                except Exception as e:
-                    error_output = str(e)
-                    results.append({"passed": False, "error": str(e)})
+        if get_settings().SANDBOX_ENABLED:
+            results, passed, error_output = await self._execute_sandbox(
+                code=code,
+                test_cases=test_cases,
+                language=challenge.language,
+            )
         else:
             # Simplified evaluation without sandbox
             # Just check if code is syntactically valid
             try:
                 if challenge.language == "python":
-                    compile(code, "<string>", "exec")
+                    _compile_cached(code)
                     # Assume passes if valid syntax
                     passed = total // 2  # Give partial credit
                     results = [{"passed": True, "note": "Sandbox disabled"}] * passed
@@ -183,26 +357,30 @@ class CodingService:
                 error_output = f"Syntax error: {e}"
                 results = [{"passed": False, "error": error_output}]
         
-        # Create submission record
-        submission = CodeSubmission(
-            challenge_id=challenge_id,
-            code=code,
-            passed_tests=passed,
-            total_tests=total,
-            output=str(results),
-            error=error_output,
-        )
-        self.db.add(submission)
+        # Create submission record; RETURNING skips the refresh SELECT
+        submission_id = self.db.execute(
+            insert(CodeSubmission)
+            .values(
+                challenge_id=challenge_id,
+                code=code,
+                passed_tests=passed,
+                total_tests=total,
+                # Compact JSON rather than Python repr: parseable
+                # downstream, roughly half the bytes
+                output=orjson.dumps(results).decode(),
+                error=error_output,
+            )
+            .returning(CodeSubmission.id)
+        ).scalar_one()
         self.db.commit()
-        self.db.refresh(submission)
-        
+
         # Update concept mastery if applicable
         if challenge.concept and passed > 0:
             from app.services.quiz_service import QuizService
             # This would update mastery, but we'll skip the cross-service call here
-        
+
         return {
-            "submission_id": submission.id,
+            "submission_id": submission_id,
             "passed_tests": passed,
             "total_tests": total,
             "score": passed / total if total > 0 else 0.0,
@@ -213,71 +391,159 @@ class CodingService:
     async def _execute_sandbox(
         self,
         code: str,
-        test_input: str,
-        expected: str,
+        test_cases: List[Dict],
         language: str,
-    ) -> Dict:
-        """Execute code in a sandboxed environment.
-        
-        This is a placeholder for real sandbox implementation.
-        In production, use Docker, Firecracker, or a service like Judge0.
+    ) -> tuple:
+        """Execute code against all test cases in a sandbox worker.
+
+        The whole submission runs as one task on the shared pre-forked
+        worker pool, which amortizes interpreter startup across every test
+        case (and every submission). Workers run under CPU/memory rlimits;
+        this is still a placeholder for a real sandbox — in production, use
+        Docker, Firecracker, or a service like Judge0.
+
+        Returns:
+            Tuple of (per-case results, passed count, error output)
         """
         if language != "python":
-            return {"passed": False, "error": f"Language {language} not supported"}
-        
-        # Create temp file
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
-            # Wrap code with test execution
-            test_code = f"""
-{code}
-
-# Test execution
-result = solution({test_input})
-print(result)
-"""
-            f.write(test_code)
-            f.flush()
-            
+            return (
+                [{"passed": False, "error": f"Language {language} not supported"}],
+                0,
+                f"Language {language} not supported",
+            )
+
+        results: List[Dict] = []
+        passed = 0
+        error_output = None
+        test_inputs = [tc.get("input") for tc in test_cases]
+
+        try:
             try:
-                # Run with timeout
-                result = subprocess.run(
-                    ['python3', f.name],
-                    capture_output=True,
-                    text=True,
-                    timeout=settings.SANDBOX_TIMEOUT_SECONDS,
-                )
-                
-                output = result.stdout.strip()
-                passed = output == expected
-                
-                return {
-                    "passed": passed,
-                    "output": output,
-                    "expected": expected,
-                    "error": result.stderr if result.stderr else None,
-                }
-            except subprocess.TimeoutExpired:
-                return {"passed": False, "error": "Execution timed out"}
+                pool = _get_sandbox_pool()
             except Exception as e:
-                return {"passed": False, "error": str(e)}
-            finally:
-                os.unlink(f.name)
+                logger.warning(
+                    "Sandbox pool unavailable; batching through one subprocess",
+                    error=str(e),
+                )
+                pool = None
+
+            # Either path waits off the event loop: the pool result via a
+            # thread, the subprocess via asyncio's own process transport —
+            # submit_code no longer stalls other requests for the full
+            # sandbox timeout
+            if pool is not None:
+                async_result = pool.apply_async(_run_user_code, (code, test_inputs))
+                raw_results = await asyncio.to_thread(
+                    async_result.get, get_settings().SANDBOX_TIMEOUT_SECONDS
+                )
+            else:
+                raw_results = await self._execute_sandbox_batch(code, test_inputs)
+
+            for tc, raw in zip(test_cases, raw_results):
+                if "error" in raw:
+                    results.append({"passed": False, "error": raw["error"]})
+                    continue
+                case_passed = raw["output"] == tc.get("expected")
+                if case_passed:
+                    passed += 1
+                results.append({
+                    "passed": case_passed,
+                    "output": raw["output"],
+                    "expected": tc.get("expected"),
+                })
+        except (multiprocessing.TimeoutError, asyncio.TimeoutError):
+            error_output = "Execution timed out"
+            results.append({"passed": False, "error": error_output})
+        except Exception as e:
+            error_output = str(e)
+            results.append({"passed": False, "error": error_output})
+
+        return results, passed, error_output
+
+    async def _execute_sandbox_batch(self, code: str, test_inputs: List[str]) -> List[Dict]:
+        """Run all test cases through a single python3 subprocess.
+
+        Fallback when the worker pool cannot start: the submission plus a
+        small driver loads the user code once and streams results back as
+        newline-delimited JSON, so interpreter startup is still paid once
+        per submission rather than once per test case.
+        """
+        driver = f"{code}\n{_SANDBOX_DRIVER_FOOTER}"
+        stdin = "".join(json.dumps({"input": ti}) + "\n" for ti in test_inputs)
+
+        proc = await asyncio.create_subprocess_exec(
+            sys.executable, "-c", driver,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        try:
+            stdout, stderr = await asyncio.wait_for(
+                proc.communicate(stdin.encode()),
+                timeout=get_settings().SANDBOX_TIMEOUT_SECONDS,
+            )
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+            raise
+
+        stderr_text = stderr.decode().strip()
+        if proc.returncode != 0:
+            error = stderr_text or "Execution failed"
+            return [{"error": error} for _ in test_inputs]
+
+        lines = stdout.decode().splitlines()
+        raw_results = [json.loads(line) for line in lines if line]
+        # A crash mid-stream leaves fewer result lines than inputs
+        raw_results += [
+            {"error": stderr_text or "No output"}
+            for _ in range(len(test_inputs) - len(raw_results))
+        ]
+        return raw_results
     
-    def get_challenge(self, challenge_id: int) -> Optional[CodingChallenge]:
-        """Get a challenge by ID."""
-        return self.db.query(CodingChallenge).filter(
+    def get_challenge(self, challenge_id: int) -> Optional[ChallengeView]:
+        """Get a challenge by ID.
+
+        Served from the module-level LRU when possible; a hit skips the
+        SELECT entirely on both reads and submissions.
+        """
+        with _challenge_cache_lock:
+            view = _CHALLENGE_CACHE.get(challenge_id)
+            if view is not None:
+                _CHALLENGE_CACHE.move_to_end(challenge_id)
+                return view
+
+        challenge = self.db.query(CodingChallenge).filter(
             CodingChallenge.id == challenge_id
         ).first()
+
+        if not challenge:
+            return None
+
+        view = ChallengeView(
+            id=challenge.id,
+            title=challenge.title,
+            problem=challenge.problem,
+            language=challenge.language,
+            difficulty=challenge.difficulty,
+            starter_code=challenge.starter_code,
+            test_cases=challenge.test_cases,
+            solution=challenge.solution,
+            concept=challenge.concept,
+        )
+        _cache_challenge(view)
+        return view
     
     def _default_challenge(self, topic: str, language: str) -> Dict:
-        """Fallback challenge if LLM fails."""
+        """Fallback challenge if LLM fails.
+
+        Only the topic-dependent fields are built per call; everything
+        else references the module-level constants.
+        """
         return {
             "title": f"Practice {topic}",
             "problem": f"Write a function that demonstrates your understanding of {topic}.",
-            "starter_code": "def solution(x):\n    # Your code here\n    pass",
-            "test_cases": [
-                {"input": "1", "expected": "1"},
-                {"input": "2", "expected": "2"},
-            ],
-            "solution": "def solution(x):\n    return x",
+            "starter_code": _DEFAULT_STARTER_CODE,
+            "test_cases": [dict(tc) for tc in _DEFAULT_TEST_CASES],
+            "solution": _DEFAULT_SOLUTION,
         }
@@ -1,16 +1,37 @@
 """Quiz service for evaluation."""
 
-from typing import List, Optional, Dict
-from sqlalchemy.orm import Session
+import asyncio
+import hashlib
+import json
+import re
 
-from shared.llm import get_llm_provider, LLMProvider
-from shared.db.models import Quiz, QuizQuestion, QuizAttempt, ConceptMastery, QuestionType
+from datetime import date
+from functools import lru_cache
+from typing import Any, List, Optional, Dict, Tuple
+from sqlalchemy.orm import Session, selectinload
+
+from shared.llm import get_llm_provider, LLMProvider, SemanticLLMCache
+from shared.db.models import (
+    Commitment,
+    ConceptMastery,
+    QuestionType,
+    Quiz,
+    QuizAttempt,
+    QuizQuestion,
+)
 from shared.observability import get_logger
+from app.core.config import get_settings
 
 logger = get_logger(__name__)
 
 
-QUIZ_GENERATION_PROMPT = """Generate a quiz for testing knowledge on: {topic}
+# Prompts are rendered by f-string functions rather than .format on a
+# template constant: CPython compiles the interpolation to bytecode, so
+# no format string is re-parsed per request, and the common quiz prompt
+# shapes are memoized outright
+@lru_cache(maxsize=256)
+def _render_quiz_prompt(topic: str, level: str, concepts: str, num_questions: int) -> str:
+    return f"""Generate a quiz for testing knowledge on: {topic}
 
 User's current level: {level}
 Recent concepts covered: {concepts}
@@ -40,12 +61,12 @@ Respond in JSON format:
 }}"""
 
 
-JUDGE_PROMPT = """You are evaluating a student's answer to a quiz question.
-
-Question: {question}
-Correct Answer: {correct_answer}
-Student's Answer: {user_answer}
-Concept: {concept}
+# Static instructions lead and the variable fields trail so provider-side
+# prompt caching can reuse the shared prefix across judge calls
+def _render_judge_prompt(
+    question: str, correct_answer: str, user_answer: str, concept: str
+) -> str:
+    return f"""You are evaluating a student's answer to a quiz question.
 
 Evaluate the student's answer and provide:
 1. Score (0.0 to 1.0)
@@ -57,15 +78,97 @@ Respond in JSON format:
     "score": 0.8,
     "feedback": "Your explanation of why the answer is correct/incorrect",
     "concept_understood": true
-}}"""
+}}
+
+Question: {question}
+Correct Answer: {correct_answer}
+Student's Answer: {user_answer}
+Concept: {concept}"""
+
+# Bump to invalidate exact-match judge cache entries when the prompt or
+# grading semantics change
+JUDGE_PROMPT_VERSION = 1
+
+# Schemas built once at import: requests stop re-allocating the nested
+# dicts, and the stable identity keeps semantic-cache bucket hashing cheap
+_QUIZ_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "topic": {"type": "string"},
+        "questions": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "question": {"type": "string"},
+                    "type": {"type": "string"},
+                    "options": {"type": "object"},
+                    "correct_answer": {"type": "string"},
+                    "concept": {"type": "string"},
+                },
+            },
+        },
+    },
+    "required": ["topic", "questions"],
+}
+
+_JUDGE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "score": {"type": "number"},
+        "feedback": {"type": "string"},
+        "concept_understood": {"type": "boolean"},
+    },
+    "required": ["score", "feedback"],
+}
+
+_JUDGE_CACHE_TTL = 7 * 24 * 3600
+
+
+def _normalize_answer(answer: str) -> str:
+    """Collapse trivial variants so they share one judge-cache key."""
+    return re.sub(r"\s+", " ", answer.strip().lower())
+
+
+def _judge_cache_key(question_id: int, user_answer: str) -> str:
+    digest = hashlib.sha256(
+        f"{question_id}|{_normalize_answer(user_answer)}|{JUDGE_PROMPT_VERSION}".encode()
+    ).hexdigest()
+    return f"judge:{digest}"
 
 
 class QuizService:
     """Service for quiz generation and evaluation."""
     
-    def __init__(self, db: Session, llm: Optional[LLMProvider] = None):
+    def __init__(
+        self,
+        db: Session,
+        llm: Optional[LLMProvider] = None,
+        semcache: Optional[SemanticLLMCache] = None,
+        redis: Optional[Any] = None,
+    ):
         self.db = db
         self.llm = llm or get_llm_provider()
+        self.semcache = semcache
+        self.redis = redis
+
+    async def _structured_output(self, prompt: str, schema: Dict) -> Dict:
+        """Call the LLM through the semantic cache when one is configured.
+
+        Near-identical prompts (same topic/level across users, popular
+        answers to the same question) resolve to a cached response
+        instead of a fresh LLM round trip.
+        """
+        if self.semcache is None:
+            return await self.llm.structured_output(prompt=prompt, schema=schema)
+
+        cached = await self.semcache.get(prompt, schema)
+        if cached is not None:
+            return cached
+
+        response = await self.llm.structured_output(prompt=prompt, schema=schema)
+        await self.semcache.set(prompt, schema, response)
+        return response
     
     async def generate_quiz(
         self,
@@ -86,68 +189,35 @@ class QuizService:
             Quiz data with questions
         """
         logger.info("Generating quiz", user_id=user_id, topic=topic, num_questions=num_questions)
-        
-        # Get weak concepts for this user
-        weak_concepts = self.db.query(ConceptMastery).filter(
-            ConceptMastery.user_id == user_id,
-            ConceptMastery.times_seen > 0,
-        ).order_by(
-            (ConceptMastery.times_correct / ConceptMastery.times_seen).asc()
-        ).limit(3).all()
-        
+
+        # The weak-concepts and commitment reads are independent: run them
+        # in worker threads concurrently (each on its own session) and off
+        # the event loop, then chain the LLM call that needs their output
+        weak_concepts, commitment = await asyncio.gather(
+            asyncio.to_thread(self._fetch_weak_concepts, user_id),
+            asyncio.to_thread(self._fetch_active_commitment, user_id),
+        )
+
         concepts_text = ", ".join([c.concept for c in weak_concepts]) if weak_concepts else "general concepts"
-        
-        # Get current week
-        from shared.db.models import Commitment
-        from datetime import date
-        
-        commitment = self.db.query(Commitment).filter(
-            Commitment.user_id == user_id,
-            Commitment.is_active == True
-        ).first()
-        
+
         week = 1
         if commitment:
             week = max(1, (date.today() - commitment.created_at.date()).days // 7 + 1)
         
         # Generate with LLM
         try:
-            prompt = QUIZ_GENERATION_PROMPT.format(
-                topic=topic,
-                level=level,
-                concepts=concepts_text,
-                num_questions=num_questions,
-            )
+            prompt = _render_quiz_prompt(topic, level, concepts_text, num_questions)
             
-            llm_response = await self.llm.structured_output(
+            llm_response = await self._structured_output(
                 prompt=prompt,
-                schema={
-                    "type": "object",
-                    "properties": {
-                        "topic": {"type": "string"},
-                        "questions": {
-                            "type": "array",
-                            "items": {
-                                "type": "object",
-                                "properties": {
-                                    "question": {"type": "string"},
-                                    "type": {"type": "string"},
-                                    "options": {"type": "object"},
-                                    "correct_answer": {"type": "string"},
-                                    "concept": {"type": "string"},
-                                },
-                            },
-                        },
-                    },
-                    "required": ["topic", "questions"],
-                },
+                schema=_QUIZ_SCHEMA,
             )
-            
+
         except Exception as e:
             logger.error("LLM quiz generation failed", error=str(e))
             llm_response = self._default_quiz(topic, num_questions)
         
-        # Create quiz record
+        # Create quiz record; flush assigns the PK without committing yet
         quiz = Quiz(
             user_id=user_id,
             week=week,
@@ -156,40 +226,69 @@ class QuizService:
             completed=False,
         )
         self.db.add(quiz)
-        self.db.commit()
-        self.db.refresh(quiz)
-        
-        # Create question records
-        questions_data = []
-        for q in llm_response.get("questions", []):
-            q_type = QuestionType.MCQ if q.get("type") == "mcq" else QuestionType.SHORT_ANSWER
-            
-            question = QuizQuestion(
+        self.db.flush()
+
+        # Create question records in one batch: a single flush populates
+        # all PKs and one commit replaces the per-question commit loop
+        questions = [
+            QuizQuestion(
                 quiz_id=quiz.id,
                 question=q.get("question", ""),
-                question_type=q_type,
+                question_type=(
+                    QuestionType.MCQ if q.get("type") == "mcq" else QuestionType.SHORT_ANSWER
+                ),
                 options=q.get("options"),
                 correct_answer=q.get("correct_answer", ""),
                 concept=q.get("concept"),
             )
-            self.db.add(question)
-            self.db.commit()
-            self.db.refresh(question)
-            
-            questions_data.append({
+            for q in llm_response.get("questions", [])
+        ]
+        self.db.add_all(questions)
+        self.db.commit()
+
+        questions_data = [
+            {
                 "id": question.id,
                 "question": question.question,
                 "type": question.question_type.value,
                 "options": question.options,
                 "concept": question.concept,
-            })
-        
+            }
+            for question in questions
+        ]
+
         return {
             "quiz_id": quiz.id,
             "topic": topic,
             "questions": questions_data,
         }
-    
+
+    def _fetch_weak_concepts(self, user_id: int) -> List[ConceptMastery]:
+        """Read the user's three weakest concepts.
+
+        Runs in a worker thread concurrently with the commitment read, so
+        it opens a dedicated session on the same engine instead of sharing
+        self.db across threads. The persisted ratio lets the
+        (user_id, mastery_ratio) index drive the sort instead of a
+        per-row division over a full scan.
+        """
+        with Session(bind=self.db.get_bind()) as db:
+            return db.query(ConceptMastery).filter(
+                ConceptMastery.user_id == user_id,
+                ConceptMastery.times_seen > 0,
+            ).order_by(
+                ConceptMastery.mastery_ratio.asc()
+            ).limit(3).all()
+
+    def _fetch_active_commitment(self, user_id: int) -> Optional[Commitment]:
+        """Read the user's active commitment on a dedicated session."""
+        with Session(bind=self.db.get_bind()) as db:
+            return db.query(Commitment).filter(
+                Commitment.user_id == user_id,
+                Commitment.is_active == True
+            ).first()
+
+
     async def submit_quiz(
         self,
         quiz_id: int,
@@ -206,65 +305,50 @@ class QuizService:
         """
         logger.info("Grading quiz", quiz_id=quiz_id, num_answers=len(answers))
         
-        quiz = self.db.query(Quiz).filter(Quiz.id == quiz_id).first()
+        # Eager-load questions with the quiz: one round-trip instead of two
+        quiz = (
+            self.db.query(Quiz)
+            .options(selectinload(Quiz.questions))
+            .filter(Quiz.id == quiz_id)
+            .first()
+        )
         if not quiz:
             return {"error": "Quiz not found"}
-        
-        questions = self.db.query(QuizQuestion).filter(
-            QuizQuestion.quiz_id == quiz_id
-        ).all()
-        
-        questions_by_id = {q.id: q for q in questions}
-        
+
+        questions_by_id = {q.id: q for q in quiz.questions}
+
+        graded = [
+            (answer.get("question_id"), answer.get("answer", ""))
+            for answer in answers
+            if answer.get("question_id") in questions_by_id
+        ]
+
+        # Judge all answers concurrently: total latency is the slowest
+        # single call instead of the sum, with a semaphore keeping the
+        # provider within its rate limits
+        semaphore = asyncio.Semaphore(get_settings().LLM_MAX_CONCURRENCY)
+        verdicts = await asyncio.gather(
+            *(
+                self._judge_one(questions_by_id[qid], user_answer, semaphore)
+                for qid, user_answer in graded
+            ),
+            return_exceptions=True,
+        )
+
         total_score = 0.0
         results = []
-        
-        for answer in answers:
-            question_id = answer.get("question_id")
-            user_answer = answer.get("answer", "")
-            
-            question = questions_by_id.get(question_id)
-            if not question:
-                continue
-            
-            # Grade with LLM
-            try:
-                judge_prompt = JUDGE_PROMPT.format(
-                    question=question.question,
-                    correct_answer=question.correct_answer,
-                    user_answer=user_answer,
-                    concept=question.concept or "general",
-                )
-                
-                judge_response = await self.llm.structured_output(
-                    prompt=judge_prompt,
-                    schema={
-                        "type": "object",
-                        "properties": {
-                            "score": {"type": "number"},
-                            "feedback": {"type": "string"},
-                            "concept_understood": {"type": "boolean"},
-                        },
-                        "required": ["score", "feedback"],
-                    },
+        mastery_deltas: Dict[str, List[int]] = {}
+
+        for (question_id, user_answer), verdict in zip(graded, verdicts):
+            question = questions_by_id[question_id]
+            if isinstance(verdict, BaseException):
+                logger.error("LLM judging failed", error=str(verdict))
+                score, feedback, understood = self._fallback_judgement(
+                    question, user_answer
                 )
-                
-                score = judge_response.get("score", 0.0)
-                feedback = judge_response.get("feedback", "")
-                understood = judge_response.get("concept_understood", score > 0.6)
-                
-            except Exception as e:
-                logger.error("LLM judging failed", error=str(e))
-                # Simple fallback: exact match gives 1.0, partial 0.5
-                if user_answer.lower().strip() == question.correct_answer.lower().strip():
-                    score = 1.0
-                elif question.correct_answer.lower() in user_answer.lower():
-                    score = 0.5
-                else:
-                    score = 0.0
-                feedback = "Answer evaluated"
-                understood = score > 0.5
-            
+            else:
+                score, feedback, understood = verdict
+
             # Record attempt
             attempt = QuizAttempt(
                 question_id=question_id,
@@ -273,15 +357,12 @@ class QuizService:
                 feedback=feedback,
             )
             self.db.add(attempt)
-            
-            # Update concept mastery
+
+            # Accumulate concept mastery deltas; applied in one batch below
             if question.concept:
-                await self._update_concept_mastery(
-                    quiz.user_id,
-                    question.concept,
-                    understood,
-                )
-            
+                delta = mastery_deltas.setdefault(question.concept, [0, 0])
+                delta[0 if understood else 1] += 1
+
             total_score += score
             results.append({
                 "question_id": question_id,
@@ -291,7 +372,9 @@ class QuizService:
                 "concept_understood": understood,
             })
         
-        # Update quiz
+        self._update_concept_masteries(quiz.user_id, mastery_deltas)
+
+        # Update quiz; one commit covers attempts, masteries and the score
         avg_score = total_score / len(answers) if answers else 0.0
         quiz.score = avg_score
         quiz.completed = True
@@ -303,35 +386,124 @@ class QuizService:
             "results": results,
         }
     
-    async def _update_concept_mastery(
+    async def _judge_one(
+        self,
+        question: QuizQuestion,
+        user_answer: str,
+        semaphore: asyncio.Semaphore,
+    ) -> Tuple[float, str, bool]:
+        """Grade a single answer with the LLM judge.
+
+        Returns:
+            (score, feedback, understood); falls back to string matching
+            when the LLM call fails
+        """
+        try:
+            # Judging is deterministic for the same (question, answer), so
+            # an exact-match hit skips the LLM call and the semaphore slot
+            cache_key = _judge_cache_key(question.id, user_answer)
+            judge_response = await self._judge_cache_get(cache_key)
+
+            if judge_response is None:
+                judge_prompt = _render_judge_prompt(
+                    question.question,
+                    question.correct_answer,
+                    user_answer,
+                    question.concept or "general",
+                )
+
+                async with semaphore:
+                    judge_response = await self._structured_output(
+                        prompt=judge_prompt,
+                        schema=_JUDGE_SCHEMA,
+                    )
+                await self._judge_cache_set(cache_key, judge_response)
+
+            score = judge_response.get("score", 0.0)
+            feedback = judge_response.get("feedback", "")
+            understood = judge_response.get("concept_understood", score > 0.6)
+            return score, feedback, understood
+
+        except Exception as e:
+            logger.error("LLM judging failed", error=str(e))
+            return self._fallback_judgement(question, user_answer)
+
+    async def _judge_cache_get(self, key: str) -> Optional[Dict]:
+        """Exact-match judge cache lookup; outages count as misses."""
+        if self.redis is None:
+            return None
+        try:
+            cached = await self.redis.get(key)
+            return json.loads(cached) if cached else None
+        except Exception as e:
+            logger.warning("Judge cache lookup failed", error=str(e))
+            return None
+
+    async def _judge_cache_set(self, key: str, response: Dict) -> None:
+        """Store a judge verdict; outages are ignored."""
+        if self.redis is None:
+            return
+        try:
+            await self.redis.setex(key, _JUDGE_CACHE_TTL, json.dumps(response))
+        except Exception as e:
+            logger.warning("Judge cache store failed", error=str(e))
+
+    def _fallback_judgement(
+        self,
+        question: QuizQuestion,
+        user_answer: str,
+    ) -> Tuple[float, str, bool]:
+        """Simple fallback: exact match gives 1.0, partial 0.5."""
+        if user_answer.lower().strip() == question.correct_answer.lower().strip():
+            score = 1.0
+        elif question.correct_answer.lower() in user_answer.lower():
+            score = 0.5
+        else:
+            score = 0.0
+        return score, "Answer evaluated", score > 0.5
+
+    def _update_concept_masteries(
         self,
         user_id: int,
-        concept: str,
-        understood: bool,
+        deltas: Dict[str, List[int]],
     ):
-        """Update concept mastery tracking."""
-        mastery = self.db.query(ConceptMastery).filter(
-            ConceptMastery.user_id == user_id,
-            ConceptMastery.concept == concept,
-        ).first()
-        
-        if mastery:
-            mastery.times_seen += 1
-            if understood:
-                mastery.times_correct += 1
-            else:
-                mastery.times_wrong += 1
-        else:
-            mastery = ConceptMastery(
-                user_id=user_id,
-                concept=concept,
-                times_seen=1,
-                times_correct=1 if understood else 0,
-                times_wrong=0 if understood else 1,
+        """Apply aggregated (correct, wrong) deltas per concept.
+
+        All existing rows are fetched in one query and new concepts are
+        added to the session in one pass; the caller's commit persists
+        everything, so grading a quiz costs one SELECT and one commit
+        instead of a SELECT plus commit per question.
+        """
+        if not deltas:
+            return
+
+        existing = {
+            m.concept: m
+            for m in self.db.query(ConceptMastery).filter(
+                ConceptMastery.user_id == user_id,
+                ConceptMastery.concept.in_(list(deltas)),
             )
-            self.db.add(mastery)
-        
-        self.db.commit()
+        }
+
+        for concept, (correct, wrong) in deltas.items():
+            mastery = existing.get(concept)
+            if mastery:
+                mastery.times_seen += correct + wrong
+                mastery.times_correct += correct
+                mastery.times_wrong += wrong
+                mastery.mastery_ratio = mastery.times_correct / max(mastery.times_seen, 1)
+            else:
+                seen = correct + wrong
+                self.db.add(
+                    ConceptMastery(
+                        user_id=user_id,
+                        concept=concept,
+                        times_seen=seen,
+                        times_correct=correct,
+                        times_wrong=wrong,
+                        mastery_ratio=correct / max(seen, 1),
+                    )
+                )
     
     def _default_quiz(self, topic: str, num_questions: int) -> Dict:
         """Fallback quiz if LLM fails."""
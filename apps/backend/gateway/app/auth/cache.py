@@ -0,0 +1,44 @@
+"""Short-TTL cache of user account state for the token refresh path.
+
+Active users refresh on a timer from every open tab, and each refresh
+only needs to know that the account still exists and is active. Caching
+that pair for a few seconds removes a primary-key SELECT per refresh;
+the 30s window bounds how long a deactivated account can keep minting
+tokens. Missing users are never cached.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+_CACHE: OrderedDict[int, Tuple[bool, str, float]] = OrderedDict()
+_CACHE_MAXSIZE = 5_000
+_CACHE_TTL = 30.0
+
+
+def get(user_id: int) -> Optional[Tuple[bool, str]]:
+    """Return cached (is_active, email) for a user, or None on miss."""
+    entry = _CACHE.get(user_id)
+    if entry is None:
+        return None
+
+    is_active, email, cached_at = entry
+    if time.monotonic() - cached_at >= _CACHE_TTL:
+        _CACHE.pop(user_id, None)
+        return None
+
+    _CACHE.move_to_end(user_id)
+    return is_active, email
+
+
+def put(user_id: int, is_active: bool, email: str) -> None:
+    """Cache a user's account state."""
+    _CACHE[user_id] = (is_active, email, time.monotonic())
+    _CACHE.move_to_end(user_id)
+    while len(_CACHE) > _CACHE_MAXSIZE:
+        _CACHE.popitem(last=False)
+
+
+def invalidate(user_id: int) -> None:
+    """Drop a user's cached state after logout, deactivation or reset."""
+    _CACHE.pop(user_id, None)
@@ -1,5 +1,10 @@
 """Authentication dependencies."""
 
+import time
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
@@ -14,10 +19,57 @@ reusable_oauth2 = OAuth2PasswordBearer(
 )
 
 
+@dataclass(frozen=True, slots=True)
+class AuthedUser:
+    """Detached snapshot of an authenticated user.
+
+    Carries the fields responses need without binding a live ORM object
+    (and its session) into the cache.
+    """
+
+    id: int
+    email: str
+    full_name: Optional[str]
+    is_active: bool
+    is_verified: bool
+    created_at: datetime
+
+
+# Short-TTL cache so chatty clients don't cost one user SELECT per API
+# call; entries expire quickly enough that deactivation takes effect
+# within seconds
+_USER_CACHE: "OrderedDict[int, tuple[AuthedUser, float]]" = OrderedDict()
+_USER_CACHE_MAXSIZE = 10_000
+_USER_CACHE_TTL = 30.0
+
+
+def _user_cache_get(user_id: int) -> Optional[AuthedUser]:
+    entry = _USER_CACHE.get(user_id)
+    if entry is None:
+        return None
+    user, expires_at = entry
+    if time.monotonic() >= expires_at:
+        _USER_CACHE.pop(user_id, None)
+        return None
+    return user
+
+
+def _user_cache_put(user: AuthedUser) -> None:
+    _USER_CACHE[user.id] = (user, time.monotonic() + _USER_CACHE_TTL)
+    _USER_CACHE.move_to_end(user.id)
+    if len(_USER_CACHE) > _USER_CACHE_MAXSIZE:
+        _USER_CACHE.popitem(last=False)
+
+
+def invalidate_user_cache(user_id: int) -> None:
+    """Drop a cached user snapshot (call after mutating the user row)."""
+    _USER_CACHE.pop(user_id, None)
+
+
 async def get_current_user(
     db: Session = Depends(get_session),
     token: str = Depends(reusable_oauth2)
-) -> User:
+) -> AuthedUser:
     """Get the current authenticated user from JWT token."""
     token_data = verify_token(token)
     if not token_data:
@@ -26,18 +78,31 @@ async def get_current_user(
             detail="Could not validate credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    
+
+    cached = _user_cache_get(token_data.user_id)
+    if cached is not None:
+        return cached
+
     user = db.query(User).filter(User.id == token_data.user_id).first()
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
-    
+
     if not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Inactive user"
         )
-        
-    return user
+
+    snapshot = AuthedUser(
+        id=user.id,
+        email=user.email,
+        full_name=user.full_name,
+        is_active=user.is_active,
+        is_verified=user.is_verified,
+        created_at=user.created_at,
+    )
+    _user_cache_put(snapshot)
+    return snapshot
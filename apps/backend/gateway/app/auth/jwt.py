@@ -1,6 +1,10 @@
 """JWT token handling."""
 
+import asyncio
+import time
+
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Optional
 from jose import JWTError, jwt
 import bcrypt
@@ -9,21 +13,30 @@ from pydantic import BaseModel
 from app.core.config import settings
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a plain password against a hashed password."""
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """Verify a plain password against a hashed password.
+
+    bcrypt burns ~100ms of CPU by design; running it in a worker thread
+    keeps the event loop serving other requests in the meantime.
+    """
     try:
-        return bcrypt.checkpw(
-            plain_password.encode("utf-8"), hashed_password.encode("utf-8")
+        return await asyncio.to_thread(
+            bcrypt.checkpw,
+            plain_password.encode("utf-8"),
+            hashed_password.encode("utf-8"),
         )
     except Exception:
         return False
 
 
-def get_password_hash(password: str) -> str:
-    """Hash a password using bcrypt."""
+async def get_password_hash(password: str) -> str:
+    """Hash a password using bcrypt, off the event loop."""
     # Bcrypt has a 72-byte limit, but it's only a problem if we don't truncate or hash first.
     # For standard passwords, 72 bytes is plenty.
-    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+    hashed = await asyncio.to_thread(
+        bcrypt.hashpw, password.encode("utf-8"), bcrypt.gensalt()
+    )
+    return hashed.decode("utf-8")
 
 
 class TokenData(BaseModel):
@@ -106,14 +119,27 @@ def create_refresh_token(
     )
 
 
-def decode_token(token: str) -> Optional[TokenData]:
-    """Decode and validate a JWT token.
-    
-    Args:
-        token: JWT token string
-        
-    Returns:
-        TokenData if valid, None otherwise
+def _looks_like_jwt(token: str) -> bool:
+    """Cheap structural prefilter run before any HMAC work.
+
+    A JWT is exactly three non-empty base64url segments separated by
+    dots; garbage tokens from scanners fail this in microseconds and
+    never reach jwt.decode or the decode cache.
+    """
+    parts = token.split(".")
+    return len(parts) == 3 and all(parts)
+
+
+@lru_cache(maxsize=10_000)
+def _decode_cached(token: str) -> Optional[tuple]:
+    """Decode a token once and memoize the result.
+
+    Clients resend the same bearer token on every request, so the
+    HMAC-SHA256 + base64 + JSON work is paid once per token instead of
+    per call. Returns (TokenData, exp_epoch, token_type), or None for
+    tokens that fail signature/claim validation (also cached, so repeat
+    garbage never reaches HMAC twice). Expiry is re-checked by callers
+    on every hit.
     """
     try:
         payload = jwt.decode(
@@ -121,43 +147,69 @@ def decode_token(token: str) -> Optional[TokenData]:
             settings.JWT_SECRET_KEY,
             algorithms=[settings.JWT_ALGORITHM],
         )
-        
-        user_id = payload.get("sub")
-        email = payload.get("email")
-        exp = payload.get("exp")
-        
-        if user_id is None or email is None:
-            return None
-        
-        return TokenData(
-            user_id=int(user_id),
-            email=email,
-            exp=datetime.fromtimestamp(exp) if exp else datetime.utcnow(),
-        )
     except JWTError:
         return None
 
+    user_id = payload.get("sub")
+    email = payload.get("email")
+    exp = payload.get("exp")
+
+    if user_id is None or email is None:
+        return None
+
+    token_data = TokenData(
+        user_id=int(user_id),
+        email=email,
+        exp=datetime.fromtimestamp(exp) if exp else datetime.utcnow(),
+    )
+    return token_data, float(exp) if exp else None, payload.get("type")
+
+
+def decode_token(token: str) -> Optional[TokenData]:
+    """Decode and validate a JWT token.
+
+    Args:
+        token: JWT token string
+
+    Returns:
+        TokenData if valid, None otherwise
+    """
+    if not _looks_like_jwt(token):
+        return None
+
+    decoded = _decode_cached(token)
+    if decoded is None:
+        return None
+
+    token_data, exp, _ = decoded
+    if exp is not None and time.time() >= exp:
+        return None
+    return token_data
+
 
 def verify_token(token: str, token_type: str = "access") -> Optional[TokenData]:
     """Verify a JWT token and its type.
-    
+
+    The type check reads the cached payload rather than running a second
+    jwt.decode, so verification costs one HMAC at most.
+
     Args:
         token: JWT token string
         token_type: Expected token type ("access" or "refresh")
-        
+
     Returns:
         TokenData if valid, None otherwise
     """
-    try:
-        payload = jwt.decode(
-            token,
-            settings.JWT_SECRET_KEY,
-            algorithms=[settings.JWT_ALGORITHM],
-        )
-        
-        if payload.get("type") != token_type:
-            return None
-        
-        return decode_token(token)
-    except JWTError:
+    if not _looks_like_jwt(token):
+        return None
+
+    decoded = _decode_cached(token)
+    if decoded is None:
+        return None
+
+    token_data, exp, decoded_type = decoded
+    if decoded_type != token_type:
+        return None
+    if exp is not None and time.time() >= exp:
         return None
+    return token_data
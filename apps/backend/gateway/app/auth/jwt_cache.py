@@ -0,0 +1,70 @@
+"""Short-TTL cache for JWT verifications on the proxy hot path.
+
+Every proxied request re-presents the same bearer token, so the decode
+and signature check are paid once per token per TTL window instead of
+per request. Entries are keyed by a token hash (the raw token never
+sits in the cache) and carry the token's own expiry, which is honored
+on every hit. Only successful verifications are cached.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from app.core.config import settings
+
+_CACHE: OrderedDict[str, Tuple[int, Optional[float], float]] = OrderedDict()
+_CACHE_MAXSIZE = 10_000
+
+# Known-bad token hashes: a replayed or brute-forced token costs one
+# signature check, then a dict lookup for the rest of its window. The
+# TTL is deliberately short so a token rejected for clock skew is not
+# blacklisted once it becomes valid.
+_BAD_CACHE: OrderedDict[str, float] = OrderedDict()
+_BAD_CACHE_MAXSIZE = 10_000
+_BAD_CACHE_TTL = 5.0
+
+
+def get(token_hash: str) -> Optional[int]:
+    """Return the cached user id for a token hash, or None on miss."""
+    entry = _CACHE.get(token_hash)
+    if entry is None:
+        return None
+
+    user_id, exp, cached_at = entry
+    now = time.time()
+    if now - cached_at >= settings.JWT_CACHE_TTL_SECONDS or (
+        exp is not None and now >= exp
+    ):
+        _CACHE.pop(token_hash, None)
+        return None
+
+    _CACHE.move_to_end(token_hash)
+    return user_id
+
+
+def put(token_hash: str, user_id: int, exp: Optional[float]) -> None:
+    """Cache a successful verification."""
+    _CACHE[token_hash] = (user_id, exp, time.time())
+    _CACHE.move_to_end(token_hash)
+    while len(_CACHE) > _CACHE_MAXSIZE:
+        _CACHE.popitem(last=False)
+
+
+def is_known_bad(token_hash: str) -> bool:
+    """True when this token hash recently failed verification."""
+    rejected_at = _BAD_CACHE.get(token_hash)
+    if rejected_at is None:
+        return False
+    if time.time() - rejected_at >= _BAD_CACHE_TTL:
+        _BAD_CACHE.pop(token_hash, None)
+        return False
+    return True
+
+
+def put_bad(token_hash: str) -> None:
+    """Record a failed verification for the negative-cache window."""
+    _BAD_CACHE[token_hash] = time.time()
+    _BAD_CACHE.move_to_end(token_hash)
+    while len(_BAD_CACHE) > _BAD_CACHE_MAXSIZE:
+        _BAD_CACHE.popitem(last=False)
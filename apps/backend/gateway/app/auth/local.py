@@ -31,7 +31,7 @@ async def authenticate_user(
         # User registered via OAuth, no password set
         return None
     
-    if not verify_password(password, user.hashed_password):
+    if not await verify_password(password, user.hashed_password):
         return None
     
     return user
@@ -54,7 +54,7 @@ async def create_user(
     Returns:
         Created user
     """
-    hashed_password = get_password_hash(password)
+    hashed_password = await get_password_hash(password)
     
     user = User(
         email=email,
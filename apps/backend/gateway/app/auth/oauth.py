@@ -1,11 +1,19 @@
 """Google OAuth 2.0 + OIDC implementation."""
 
+import time
+
 from typing import Optional
+from urllib.parse import urlencode
 import httpx
+from jose import JWTError, jwt
 from pydantic import BaseModel
 
 from app.core.config import settings
 
+# Google's signing keys rotate rarely; refetching hourly amortizes the
+# JWKS request to ~24/day instead of one per login
+_JWKS_TTL = 3600.0
+
 
 class GoogleUserInfo(BaseModel):
     """Google user information from OIDC."""
@@ -23,6 +31,15 @@ class GoogleOAuth:
     AUTHORIZE_URL = "https://accounts.google.com/o/oauth2/v2/auth"
     TOKEN_URL = "https://oauth2.googleapis.com/token"
     USERINFO_URL = "https://www.googleapis.com/oauth2/v2/userinfo"
+    JWKS_URL = "https://www.googleapis.com/oauth2/v3/certs"
+
+    # Fixed authorization parameters; only client/redirect/state vary per call
+    _STATIC_AUTH_PARAMS = {
+        "response_type": "code",
+        "scope": "openid email profile",
+        "access_type": "offline",
+        "prompt": "consent",
+    }
     
     def __init__(
         self,
@@ -40,6 +57,17 @@ class GoogleOAuth:
         self.client_id = client_id or settings.GOOGLE_CLIENT_ID
         self.client_secret = client_secret or settings.GOOGLE_CLIENT_SECRET
         self.redirect_uri = redirect_uri or settings.GOOGLE_REDIRECT_URI
+        # One pooled client for the instance's lifetime: the TCP/TLS
+        # handshake to Google is paid once, not per token exchange
+        self._client = httpx.AsyncClient(
+            timeout=10.0,
+            limits=httpx.Limits(max_connections=50, max_keepalive_connections=20),
+        )
+        self._jwks: Optional[tuple] = None  # (jwks dict, fetched monotonic time)
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP client (called from app shutdown)."""
+        await self._client.aclose()
     
     def get_authorization_url(self, state: Optional[str] = None) -> str:
         """Get Google OAuth authorization URL.
@@ -53,17 +81,15 @@ class GoogleOAuth:
         params = {
             "client_id": self.client_id,
             "redirect_uri": self.redirect_uri,
-            "response_type": "code",
-            "scope": "openid email profile",
-            "access_type": "offline",
-            "prompt": "consent",
+            **self._STATIC_AUTH_PARAMS,
         }
-        
+
         if state:
             params["state"] = state
-        
-        query = "&".join(f"{k}={v}" for k, v in params.items())
-        return f"{self.AUTHORIZE_URL}?{query}"
+
+        # urlencode percent-escapes the redirect URI and state; the old
+        # manual join produced malformed URLs for values with reserved chars
+        return f"{self.AUTHORIZE_URL}?{urlencode(params)}"
     
     async def exchange_code(self, code: str) -> dict:
         """Exchange authorization code for tokens.
@@ -74,19 +100,18 @@ class GoogleOAuth:
         Returns:
             Token response with access_token, refresh_token, id_token
         """
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                self.TOKEN_URL,
-                data={
-                    "client_id": self.client_id,
-                    "client_secret": self.client_secret,
-                    "code": code,
-                    "grant_type": "authorization_code",
-                    "redirect_uri": self.redirect_uri,
-                },
-            )
-            response.raise_for_status()
-            return response.json()
+        response = await self._client.post(
+            self.TOKEN_URL,
+            data={
+                "client_id": self.client_id,
+                "client_secret": self.client_secret,
+                "code": code,
+                "grant_type": "authorization_code",
+                "redirect_uri": self.redirect_uri,
+            },
+        )
+        response.raise_for_status()
+        return response.json()
     
     async def get_user_info(self, access_token: str) -> GoogleUserInfo:
         """Get user information from Google.
@@ -97,32 +122,88 @@ class GoogleOAuth:
         Returns:
             GoogleUserInfo with user details
         """
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                self.USERINFO_URL,
-                headers={"Authorization": f"Bearer {access_token}"},
-            )
-            response.raise_for_status()
-            data = response.json()
-            
-            return GoogleUserInfo(
-                id=data["id"],
-                email=data["email"],
-                verified_email=data.get("verified_email", False),
-                name=data.get("name"),
-                picture=data.get("picture"),
-            )
+        response = await self._client.get(
+            self.USERINFO_URL,
+            headers={"Authorization": f"Bearer {access_token}"},
+        )
+        response.raise_for_status()
+        data = response.json()
+
+        return GoogleUserInfo(
+            id=data["id"],
+            email=data["email"],
+            verified_email=data.get("verified_email", False),
+            name=data.get("name"),
+            picture=data.get("picture"),
+        )
     
+    async def _get_jwks(self) -> dict:
+        """Return Google's JWKS, refetching at most once per hour."""
+        now = time.monotonic()
+        if self._jwks is not None and now - self._jwks[1] < _JWKS_TTL:
+            return self._jwks[0]
+
+        response = await self._client.get(self.JWKS_URL)
+        response.raise_for_status()
+        jwks = response.json()
+        self._jwks = (jwks, now)
+        return jwks
+
+    async def _user_info_from_id_token(self, id_token: str) -> Optional[GoogleUserInfo]:
+        """Extract user info from the id_token's verified OIDC claims.
+
+        The signature is checked against Google's cached JWKS and the
+        audience against our client id.
+
+        Returns:
+            GoogleUserInfo, or None if verification fails or required
+            claims are missing (callers fall back to the userinfo call)
+        """
+        try:
+            claims = jwt.decode(
+                id_token,
+                await self._get_jwks(),
+                algorithms=["RS256"],
+                audience=self.client_id,
+                options={"verify_at_hash": False},
+            )
+        except (JWTError, httpx.HTTPError):
+            return None
+
+        sub = claims.get("sub")
+        email = claims.get("email")
+        if not sub or not email:
+            return None
+
+        return GoogleUserInfo(
+            id=sub,
+            email=email,
+            verified_email=claims.get("email_verified", False),
+            name=claims.get("name"),
+            picture=claims.get("picture"),
+        )
+
     async def authenticate(self, code: str) -> GoogleUserInfo:
         """Full authentication flow: exchange code and get user info.
-        
+
+        The id_token returned by the code exchange already carries the
+        OIDC profile claims, so the separate userinfo round trip is only
+        made when those claims are missing.
+
         Args:
             code: Authorization code from Google
-            
+
         Returns:
             GoogleUserInfo with authenticated user details
         """
         tokens = await self.exchange_code(code)
+
+        id_token = tokens.get("id_token")
+        if id_token:
+            user_info = await self._user_info_from_id_token(id_token)
+            if user_info is not None:
+                return user_info
+
         return await self.get_user_info(tokens["access_token"])
 
 
@@ -2,7 +2,7 @@
 
 from typing import List
 from pydantic_settings import BaseSettings
-from functools import lru_cache
+from functools import cached_property, lru_cache
 
 
 class Settings(BaseSettings):
@@ -27,6 +27,7 @@ class Settings(BaseSettings):
     JWT_ALGORITHM: str = "HS256"
     JWT_ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     JWT_REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    JWT_CACHE_TTL_SECONDS: int = 30
     
     # Google OAuth
     GOOGLE_CLIENT_ID: str = ""
@@ -39,9 +40,9 @@ class Settings(BaseSettings):
     EVALUATOR_URL: str = "http://localhost:8003"
     NOTIFICATION_URL: str = "http://localhost:8004"
     
-    @property
+    @cached_property
     def cors_origins_list(self) -> List[str]:
-        """Parse CORS origins as list."""
+        """Parse CORS origins as list (computed once per instance)."""
         return [origin.strip() for origin in self.CORS_ORIGINS.split(",")]
     
     class Config:
@@ -0,0 +1,25 @@
+"""Pooled HTTP clients for talking to backend services."""
+
+from functools import lru_cache
+
+import httpx
+
+
+@lru_cache
+def get_proxy_client() -> httpx.AsyncClient:
+    """Shared client for all proxied backend traffic.
+
+    One pooled client for the process lifetime: a per-request client
+    pays a fresh TCP handshake on every proxy hop, while keep-alive
+    connections make repeat hops to the same backend near-free. The
+    connect timeout is kept short so a dead backend fails fast instead
+    of holding the request for the full read timeout.
+    """
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(60.0, connect=5.0),
+        limits=httpx.Limits(
+            max_connections=200,
+            max_keepalive_connections=100,
+            keepalive_expiry=30.0,
+        ),
+    )
@@ -6,7 +6,9 @@ from fastapi.middleware.cors import CORSMiddleware
 import os
 
 from shared.observability import RequestIdMiddleware, setup_logging, get_logger
+from app.auth.oauth import google_oauth
 from app.core.config import settings
+from app.http_clients import get_proxy_client
 from app.routes import auth, health, proxy
 
 
@@ -24,7 +26,10 @@ logger = get_logger(__name__)
 async def lifespan(app: FastAPI):
     """Application lifespan handler."""
     logger.info("Gateway service starting", port=settings.GATEWAY_PORT)
+    app.state.proxy_client = get_proxy_client()
     yield
+    await app.state.proxy_client.aclose()
+    await google_oauth.aclose()
     logger.info("Gateway service shutting down")
 
 
@@ -3,6 +3,7 @@
 import uuid
 from fastapi import APIRouter, Depends, HTTPException, status, Response
 from fastapi.responses import RedirectResponse
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from shared.db import get_session, User
@@ -22,7 +23,8 @@ from app.auth import (
     get_or_create_oauth_user,
     google_oauth,
 )
-from app.auth.dependencies import get_current_user
+from app.auth import cache as user_state_cache
+from app.auth.dependencies import AuthedUser, get_current_user
 from app.core.config import settings
 
 
@@ -97,16 +99,32 @@ async def refresh_token(
             detail="Invalid refresh token",
         )
     
-    # Verify user still exists and is active
-    user = db.query(User).filter(User.id == token_data.user_id).first()
-    if not user or not user.is_active:
+    # Verify user still exists and is active; a short-TTL cache spares
+    # the primary-key SELECT on the tabs-refreshing-every-15-minutes
+    # pattern, and the column-only query on a miss skips hydrating the
+    # full User row
+    cached = user_state_cache.get(token_data.user_id)
+    if cached is None:
+        row = db.execute(
+            select(User.is_active, User.email).where(User.id == token_data.user_id)
+        ).first()
+        if row is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="User not found or inactive",
+            )
+        cached = (row.is_active, row.email)
+        user_state_cache.put(token_data.user_id, *cached)
+
+    is_active, email = cached
+    if not is_active:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found or inactive",
         )
-    
-    access_token = create_access_token(user.id, user.email)
-    new_refresh_token = create_refresh_token(user.id, user.email)
+
+    access_token = create_access_token(token_data.user_id, email)
+    new_refresh_token = create_refresh_token(token_data.user_id, email)
     
     return TokenResponse(
         access_token=access_token,
@@ -179,7 +197,7 @@ async def forgot_password(
 
 @router.get("/me", response_model=UserResponse)
 async def get_current_user_info(
-    current_user: User = Depends(get_current_user),
+    current_user: AuthedUser = Depends(get_current_user),
 ):
     """Get current authenticated user info."""
     return current_user
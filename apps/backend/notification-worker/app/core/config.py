@@ -21,6 +21,10 @@ class Settings(BaseSettings):
     SMTP_PASSWORD: str = ""
     EMAIL_FROM: str = "noreply@learningcoach.app"
     
+    # Email delivery queue
+    EMAIL_WORKER_COUNT: int = 4
+    EMAIL_QUEUE_MAXSIZE: int = 10_000
+
     # Frontend URL for links in emails
     FRONTEND_URL: str = "http://localhost:4200"
     
@@ -1,7 +1,9 @@
 """Notification Worker API - Main Application."""
 
+import asyncio
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, Depends, BackgroundTasks
+from dataclasses import dataclass
+from fastapi import FastAPI, Depends, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy.orm import Session
 from pydantic import BaseModel, EmailStr
@@ -9,18 +11,71 @@ from typing import Optional
 
 from shared.observability import RequestIdMiddleware, setup_logging, get_logger
 from shared.db import get_session
+from shared.db.session import get_session_factory
 from app.core.config import settings
 from app.services import EmailService
+from app.services.email_service import close_smtp
 
 
 setup_logging(level=settings.LOG_LEVEL, json_format=False, service_name="notification-worker")
 logger = get_logger(__name__)
 
 
+@dataclass
+class EmailJob:
+    """One queued email send; kind names the send_* service method."""
+
+    kind: str
+    payload: dict
+
+
+async def _email_worker(queue: "asyncio.Queue[EmailJob]") -> None:
+    """Pull email jobs off the queue and deliver them.
+
+    A fixed pool of these workers bounds how many sends are in flight,
+    so request bursts queue up instead of fanning out into unbounded
+    background tasks. Each job gets its own short-lived session; the
+    request that enqueued it has long since returned.
+    """
+    session_factory = get_session_factory()
+    while True:
+        job = await queue.get()
+        try:
+            db = session_factory()
+            try:
+                service = EmailService(db)
+                await getattr(service, f"send_{job.kind}")(**job.payload)
+            finally:
+                db.close()
+        except Exception as e:
+            logger.error("Email job failed", kind=job.kind, error=str(e))
+        finally:
+            queue.task_done()
+
+
+def _enqueue_email(kind: str, **payload) -> None:
+    """Push a job onto the delivery queue; 503 when it is full."""
+    try:
+        app.state.email_queue.put_nowait(EmailJob(kind=kind, payload=payload))
+    except asyncio.QueueFull:
+        raise HTTPException(status_code=503, detail="Email queue is full")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("Notification Worker starting", port=settings.NOTIFICATION_PORT)
+    app.state.email_queue = asyncio.Queue(maxsize=settings.EMAIL_QUEUE_MAXSIZE)
+    workers = [
+        asyncio.create_task(_email_worker(app.state.email_queue))
+        for _ in range(settings.EMAIL_WORKER_COUNT)
+    ]
     yield
+    # Drain queued sends, then stop the workers and the SMTP session
+    await app.state.email_queue.join()
+    for worker in workers:
+        worker.cancel()
+    await asyncio.gather(*workers, return_exceptions=True)
+    await close_smtp()
     logger.info("Notification Worker shutting down")
 
 
@@ -67,6 +122,10 @@ class CheckinReminderRequest(BaseModel):
     name: Optional[str] = None
 
 
+class BulkCheckinReminderRequest(BaseModel):
+    recipients: list[CheckinReminderRequest]
+
+
 # Routes
 @app.get("/health")
 async def health_check():
@@ -74,83 +133,73 @@ async def health_check():
 
 
 @app.post("/v1/email/welcome")
-async def send_welcome_email(
-    request: WelcomeEmailRequest,
-    background_tasks: BackgroundTasks,
-    db: Session = Depends(get_session),
-):
+async def send_welcome_email(request: WelcomeEmailRequest):
     """Send welcome email to new user."""
-    service = EmailService(db)
-    
-    # Run in background to not block
-    background_tasks.add_task(
-        service.send_welcome,
+    _enqueue_email(
+        "welcome",
         user_id=request.user_id,
         email=request.email,
         name=request.name,
     )
-    
+
     return {"message": "Welcome email queued", "status": "pending"}
 
 
 @app.post("/v1/email/password-reset")
-async def send_password_reset_email(
-    request: PasswordResetRequest,
-    background_tasks: BackgroundTasks,
-    db: Session = Depends(get_session),
-):
+async def send_password_reset_email(request: PasswordResetRequest):
     """Send password reset email."""
-    service = EmailService(db)
-    
-    background_tasks.add_task(
-        service.send_password_reset,
+    _enqueue_email(
+        "password_reset",
         user_id=request.user_id,
         email=request.email,
         reset_token=request.reset_token,
     )
-    
+
     return {"message": "Password reset email queued", "status": "pending"}
 
 
 @app.post("/v1/email/progress-report")
-async def send_progress_report(
-    request: ProgressReportRequest,
-    background_tasks: BackgroundTasks,
-    db: Session = Depends(get_session),
-):
+async def send_progress_report(request: ProgressReportRequest):
     """Send weekly progress report."""
-    service = EmailService(db)
-    
-    background_tasks.add_task(
-        service.send_progress_report,
+    _enqueue_email(
+        "progress_report",
         user_id=request.user_id,
         email=request.email,
         name=request.name,
         metrics=request.metrics,
     )
-    
+
     return {"message": "Progress report email queued", "status": "pending"}
 
 
 @app.post("/v1/email/checkin-reminder")
-async def send_checkin_reminder(
-    request: CheckinReminderRequest,
-    background_tasks: BackgroundTasks,
-    db: Session = Depends(get_session),
-):
+async def send_checkin_reminder(request: CheckinReminderRequest):
     """Send check-in reminder email."""
-    service = EmailService(db)
-    
-    background_tasks.add_task(
-        service.send_checkin_reminder,
+    _enqueue_email(
+        "checkin_reminder",
         user_id=request.user_id,
         email=request.email,
         name=request.name,
     )
-    
+
     return {"message": "Check-in reminder email queued", "status": "pending"}
 
 
+@app.post("/v1/email/bulk/checkin-reminder")
+async def send_bulk_checkin_reminder(request: BulkCheckinReminderRequest):
+    """Send check-in reminders to many users in one SMTP transaction."""
+    _enqueue_email(
+        "bulk_checkin_reminder",
+        recipients=[(r.user_id, r.email, r.name) for r in request.recipients],
+    )
+
+    return {
+        "message": "Bulk check-in reminders queued",
+        "status": "pending",
+        "count": len(request.recipients),
+    }
+
+
 @app.get("/v1/email/logs/{user_id}")
 async def get_email_logs(
     user_id: int,
@@ -158,22 +207,37 @@ async def get_email_logs(
     db: Session = Depends(get_session),
 ):
     """Get email logs for a user."""
+    from sqlalchemy import select
     from shared.db.models import EmailLog
-    
-    logs = db.query(EmailLog).filter(
-        EmailLog.user_id == user_id
-    ).order_by(EmailLog.created_at.desc()).limit(limit).all()
-    
+
+    # Column-only select: rows come back as plain tuples, skipping full
+    # ORM instance construction, and the (user_id, created_at) index
+    # turns the sort-limit into a range scan
+    stmt = (
+        select(
+            EmailLog.id,
+            EmailLog.email_type,
+            EmailLog.subject,
+            EmailLog.status,
+            EmailLog.sent_at,
+            EmailLog.created_at,
+        )
+        .where(EmailLog.user_id == user_id)
+        .order_by(EmailLog.created_at.desc())
+        .limit(limit)
+    )
+    rows = db.execute(stmt).all()
+
     return {
         "logs": [
             {
-                "id": log.id,
-                "type": log.email_type.value,
-                "subject": log.subject,
-                "status": log.status.value,
-                "sent_at": log.sent_at.isoformat() if log.sent_at else None,
-                "created_at": log.created_at.isoformat(),
+                "id": row.id,
+                "type": row.email_type.value,
+                "subject": row.subject,
+                "status": row.status.value,
+                "sent_at": row.sent_at.isoformat() if row.sent_at else None,
+                "created_at": row.created_at.isoformat(),
             }
-            for log in logs
+            for row in rows
         ]
     }
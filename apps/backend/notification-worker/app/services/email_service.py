@@ -1,9 +1,12 @@
 """Email service for notifications."""
 
-import smtplib
+import asyncio
+
+import aiosmtplib
+import jinja2
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from typing import Optional
+from typing import List, Optional, Tuple
 from sqlalchemy.orm import Session
 from datetime import datetime
 
@@ -14,6 +17,63 @@ from app.core.config import settings
 logger = get_logger(__name__)
 
 
+# Templates are compiled once and kept in memory (cache_size=-1), so a
+# send renders pre-compiled bytecode instead of rebuilding a ~30-line
+# f-string; autoescaping also covers user-supplied names for free
+_env = jinja2.Environment(
+    loader=jinja2.PackageLoader("app.services", "templates"),
+    autoescape=True,
+    cache_size=-1,
+)
+_env.filters["percent"] = lambda value: f"{value * 100:.0f}%"
+
+
+# One SMTP connection shared by all EmailService instances: connecting,
+# STARTTLS and AUTH cost hundreds of ms per message, while MAIL/RCPT/DATA
+# on an established session cost a fraction of that. SMTP is not safe for
+# concurrent commands on one connection, so sends serialize on the lock.
+_smtp_client: Optional[aiosmtplib.SMTP] = None
+_smtp_lock: Optional[asyncio.Lock] = None
+
+
+def _get_smtp_lock() -> asyncio.Lock:
+    global _smtp_lock
+    if _smtp_lock is None:
+        _smtp_lock = asyncio.Lock()
+    return _smtp_lock
+
+
+async def _get_smtp() -> aiosmtplib.SMTP:
+    """Return the shared SMTP connection, (re)connecting lazily."""
+    global _smtp_client
+    if _smtp_client is None or not _smtp_client.is_connected:
+        client = aiosmtplib.SMTP(
+            hostname=settings.SMTP_HOST,
+            port=settings.SMTP_PORT,
+            start_tls=True,
+        )
+        await client.connect()
+        await client.login(settings.SMTP_USER, settings.SMTP_PASSWORD)
+        _smtp_client = client
+    return _smtp_client
+
+
+async def _drop_smtp() -> None:
+    """Forget the shared connection so the next send reconnects."""
+    global _smtp_client
+    client, _smtp_client = _smtp_client, None
+    if client is not None:
+        try:
+            await client.quit()
+        except Exception:
+            pass
+
+
+async def close_smtp() -> None:
+    """Close the shared SMTP connection; called at service shutdown."""
+    await _drop_smtp()
+
+
 class EmailService:
     """Service for sending email notifications."""
     
@@ -41,8 +101,10 @@ class EmailService:
             True if sent successfully
         """
         logger.info("Sending email", to=to_email, type=email_type.value)
-        
-        # Create log entry
+
+        # Build the log row in memory and persist it once with its final
+        # status: a PENDING row committed up front was only ever visible
+        # to this worker, so the extra transaction bought nothing
         log = EmailLog(
             user_id=user_id,
             email_type=email_type,
@@ -50,9 +112,7 @@ class EmailService:
             recipient=to_email,
             status=EmailStatus.PENDING,
         )
-        self.db.add(log)
-        self.db.commit()
-        
+
         # Create message
         msg = MIMEMultipart("alternative")
         msg["Subject"] = subject
@@ -65,11 +125,8 @@ class EmailService:
         # Send
         try:
             if settings.SMTP_USER and settings.SMTP_PASSWORD:
-                with smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT) as server:
-                    server.starttls()
-                    server.login(settings.SMTP_USER, settings.SMTP_PASSWORD)
-                    server.sendmail(settings.EMAIL_FROM, to_email, msg.as_string())
-                
+                await self._deliver(to_email, msg.as_string())
+
                 log.status = EmailStatus.SENT
                 log.sent_at = datetime.utcnow()
                 logger.info("Email sent successfully", to=to_email)
@@ -78,17 +135,34 @@ class EmailService:
                 logger.info("Email would be sent (SMTP not configured)", to=to_email, subject=subject)
                 log.status = EmailStatus.SENT
                 log.sent_at = datetime.utcnow()
-            
+
+            self.db.add(log)
             self.db.commit()
             return True
-            
+
         except Exception as e:
             logger.error("Failed to send email", error=str(e))
             log.status = EmailStatus.FAILED
             log.error_message = str(e)
+            self.db.add(log)
             self.db.commit()
             return False
-    
+
+    async def _deliver(self, to_email, message: str) -> None:
+        """Send one message over the shared SMTP connection.
+
+        A stale connection (idle timeout, server-side disconnect) is
+        dropped and the send retried once on a fresh one.
+        """
+        async with _get_smtp_lock():
+            try:
+                server = await _get_smtp()
+                await server.sendmail(settings.EMAIL_FROM, to_email, message)
+            except aiosmtplib.SMTPException:
+                await _drop_smtp()
+                server = await _get_smtp()
+                await server.sendmail(settings.EMAIL_FROM, to_email, message)
+
     async def send_welcome(
         self,
         user_id: int,
@@ -97,32 +171,12 @@ class EmailService:
     ) -> bool:
         """Send welcome email to new user."""
         name = name or "Learner"
-        
-        html = f"""
-        <html>
-        <body style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
-            <h1 style="color: #2563eb;">Welcome to Learning Resolution Coach! 🎓</h1>
-            <p>Hi {name},</p>
-            <p>We're excited to help you achieve your learning goals!</p>
-            <p>Here's how to get started:</p>
-            <ol>
-                <li>Set up your learning commitment</li>
-                <li>Complete the premortem assessment</li>
-                <li>Start your daily check-ins</li>
-            </ol>
-            <p>
-                <a href="{settings.FRONTEND_URL}/dashboard" 
-                   style="background: #2563eb; color: white; padding: 12px 24px; 
-                          text-decoration: none; border-radius: 6px;">
-                    Get Started
-                </a>
-            </p>
-            <p>Happy learning!</p>
-            <p><em>The Learning Resolution Coach Team</em></p>
-        </body>
-        </html>
-        """
-        
+
+        html = _env.get_template("welcome.html.j2").render(
+            name=name,
+            frontend_url=settings.FRONTEND_URL,
+        )
+
         return await self.send_email(
             user_id=user_id,
             to_email=email,
@@ -139,26 +193,9 @@ class EmailService:
     ) -> bool:
         """Send password reset email."""
         reset_url = f"{settings.FRONTEND_URL}/reset-password?token={reset_token}"
-        
-        html = f"""
-        <html>
-        <body style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
-            <h2>Reset Your Password</h2>
-            <p>We received a request to reset your password.</p>
-            <p>Click the button below to create a new password:</p>
-            <p>
-                <a href="{reset_url}" 
-                   style="background: #2563eb; color: white; padding: 12px 24px; 
-                          text-decoration: none; border-radius: 6px;">
-                    Reset Password
-                </a>
-            </p>
-            <p>This link will expire in 1 hour.</p>
-            <p>If you didn't request this, you can safely ignore this email.</p>
-        </body>
-        </html>
-        """
-        
+
+        html = _env.get_template("password_reset.html.j2").render(reset_url=reset_url)
+
         return await self.send_email(
             user_id=user_id,
             to_email=email,
@@ -176,42 +213,22 @@ class EmailService:
     ) -> bool:
         """Send weekly progress report."""
         name = name or "Learner"
-        
-        adherence = metrics.get("adherence_score", 0) * 100
-        knowledge = metrics.get("knowledge_score", 0) * 100
-        retention = metrics.get("retention_score", 0) * 100
+
         week = metrics.get("current_week", 1)
         status = metrics.get("status", "active")
-        
         status_emoji = "🟢" if status == "active" else "🟡" if status == "recovering" else "🔴"
-        
-        html = f"""
-        <html>
-        <body style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
-            <h1 style="color: #2563eb;">Your Week {week} Progress Report 📊</h1>
-            <p>Hi {name},</p>
-            <p>Here's how you did this week:</p>
-            
-            <div style="background: #f3f4f6; padding: 20px; border-radius: 8px; margin: 20px 0;">
-                <p><strong>Adherence:</strong> {adherence:.0f}%</p>
-                <p><strong>Knowledge:</strong> {knowledge:.0f}%</p>
-                <p><strong>Retention:</strong> {retention:.0f}%</p>
-                <p><strong>Status:</strong> {status_emoji} {status.title()}</p>
-            </div>
-            
-            <p>
-                <a href="{settings.FRONTEND_URL}/dashboard" 
-                   style="background: #2563eb; color: white; padding: 12px 24px; 
-                          text-decoration: none; border-radius: 6px;">
-                    View Full Dashboard
-                </a>
-            </p>
-            
-            <p>Keep up the momentum!</p>
-        </body>
-        </html>
-        """
-        
+
+        html = _env.get_template("progress_report.html.j2").render(
+            name=name,
+            week=week,
+            adherence=metrics.get("adherence_score", 0),
+            knowledge=metrics.get("knowledge_score", 0),
+            retention=metrics.get("retention_score", 0),
+            status=status,
+            status_emoji=status_emoji,
+            frontend_url=settings.FRONTEND_URL,
+        )
+
         return await self.send_email(
             user_id=user_id,
             to_email=email,
@@ -228,25 +245,12 @@ class EmailService:
     ) -> bool:
         """Send check-in reminder."""
         name = name or "Learner"
-        
-        html = f"""
-        <html>
-        <body style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
-            <h2>Time for Your Daily Check-in! ⏰</h2>
-            <p>Hi {name},</p>
-            <p>Don't forget to do your daily check-in to stay on track with your learning goals.</p>
-            <p>It only takes a minute!</p>
-            <p>
-                <a href="{settings.FRONTEND_URL}/checkin" 
-                   style="background: #2563eb; color: white; padding: 12px 24px; 
-                          text-decoration: none; border-radius: 6px;">
-                    Do Check-in Now
-                </a>
-            </p>
-        </body>
-        </html>
-        """
-        
+
+        html = _env.get_template("checkin_reminder.html.j2").render(
+            name=name,
+            frontend_url=settings.FRONTEND_URL,
+        )
+
         return await self.send_email(
             user_id=user_id,
             to_email=email,
@@ -254,3 +258,83 @@ class EmailService:
             html_content=html,
             email_type=EmailType.CHECK_IN_REMINDER,
         )
+
+    async def send_bulk_checkin_reminder(
+        self,
+        recipients: List[Tuple[int, str, Optional[str]]],
+    ) -> bool:
+        """Send one check-in reminder to many recipients at once.
+
+        The reminder body carries no per-user data beyond the greeting,
+        so the weekly fan-out can put every recipient on the envelope of
+        a single SMTP transaction (BCC-style) instead of paying one
+        MAIL/RCPT/DATA round trip per user. Per-user EmailLog rows are
+        still written, in one bulk insert and one commit.
+
+        Args:
+            recipients: (user_id, email, name) tuples; names are unused
+                in the shared body
+
+        Returns:
+            True if the batch was sent successfully
+        """
+        if not recipients:
+            return True
+
+        subject = "Time for Your Daily Check-in! ⏰"
+        logger.info("Sending bulk check-in reminders", count=len(recipients))
+
+        html = _env.get_template("checkin_reminder.html.j2").render(
+            name="Learner",
+            frontend_url=settings.FRONTEND_URL,
+        )
+
+        # Recipients ride on the envelope only; the visible To stays on
+        # the sender so addresses aren't disclosed to each other
+        msg = MIMEMultipart("alternative")
+        msg["Subject"] = subject
+        msg["From"] = settings.EMAIL_FROM
+        msg["To"] = settings.EMAIL_FROM
+        msg.attach(MIMEText(html, "html"))
+
+        logs = [
+            EmailLog(
+                user_id=user_id,
+                email_type=EmailType.CHECK_IN_REMINDER,
+                subject=subject,
+                recipient=email,
+                status=EmailStatus.PENDING,
+            )
+            for user_id, email, _ in recipients
+        ]
+
+        sent = False
+        error_message = None
+        try:
+            if settings.SMTP_USER and settings.SMTP_PASSWORD:
+                await self._deliver(
+                    [email for _, email, _ in recipients], msg.as_string()
+                )
+                logger.info("Bulk reminders sent", count=len(recipients))
+            else:
+                logger.info(
+                    "Bulk reminders would be sent (SMTP not configured)",
+                    count=len(recipients),
+                )
+            sent = True
+        except Exception as e:
+            logger.error("Failed to send bulk reminders", error=str(e))
+            error_message = str(e)
+
+        sent_at = datetime.utcnow()
+        for log in logs:
+            if sent:
+                log.status = EmailStatus.SENT
+                log.sent_at = sent_at
+            else:
+                log.status = EmailStatus.FAILED
+                log.error_message = error_message
+
+        self.db.bulk_save_objects(logs)
+        self.db.commit()
+        return sent
@@ -1,7 +1,13 @@
 """Database module for shared utilities."""
 
 from shared.db.base import Base
-from shared.db.session import get_session, get_engine, DatabaseConfig
+from shared.db.session import (
+    get_session,
+    get_engine,
+    get_async_session,
+    get_async_engine,
+    DatabaseConfig,
+)
 from shared.db.models import (
     User,
     Commitment,
@@ -26,6 +32,8 @@ __all__ = [
     "Base",
     "get_session",
     "get_engine",
+    "get_async_session",
+    "get_async_engine",
     "DatabaseConfig",
     "User",
     "Commitment",
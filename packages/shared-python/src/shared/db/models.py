@@ -13,6 +13,8 @@ from sqlalchemy import (
     ForeignKey,
     JSON,
     Enum as SQLEnum,
+    Index,
+    UniqueConstraint,
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from shared.db.base import Base
@@ -108,6 +110,10 @@ class Commitment(Base):
     """Learning commitment contract."""
 
     __tablename__ = "commitments"
+    __table_args__ = (
+        # Covers the hot "active commitment for user" lookup
+        Index("ix_commitments_user_active", "user_id", "is_active"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False, index=True)
@@ -132,11 +138,25 @@ class Commitment(Base):
     user: Mapped["User"] = relationship(back_populates="commitments")
     premortem_risks: Mapped[List["PremortermRisk"]] = relationship(back_populates="commitment")
 
+    # Week arithmetic on day ordinals: shared by every service that reports
+    # progress, so the date math lives in one place and allocates nothing
+    def weeks_since_start(self, today: date) -> int:
+        """Whole weeks elapsed since the commitment was created."""
+        return (today.toordinal() - self.created_at.toordinal()) // 7
+
+    def weeks_until_target(self, today: date) -> int:
+        """Whole weeks left until the target date (may be negative if past)."""
+        return (self.target_date.toordinal() - today.toordinal()) // 7
+
 
 class PremortermRisk(Base):
     """Premortem risk assessment."""
 
     __tablename__ = "premortem_risks"
+    __table_args__ = (
+        # Covers the priority-ordered risk lookup per commitment
+        Index("ix_premortem_risks_commitment_priority", "commitment_id", "priority"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     commitment_id: Mapped[int] = mapped_column(
@@ -157,6 +177,10 @@ class Plan(Base):
     """Weekly learning plan (versioned)."""
 
     __tablename__ = "plans"
+    __table_args__ = (
+        # Covers both "active plan for user" and "plan for user + week"
+        Index("ix_plans_user_active_week", "user_id", "is_active", "week_start"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False, index=True)
@@ -177,6 +201,10 @@ class DailyTask(Base):
     """Daily tasks derived from weekly plan."""
 
     __tablename__ = "daily_tasks"
+    __table_args__ = (
+        # Covers today's-tasks and adherence date-range scans per plan
+        Index("ix_daily_tasks_plan_date_status", "plan_id", "date", "status"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     plan_id: Mapped[int] = mapped_column(ForeignKey("plans.id"), nullable=False, index=True)
@@ -201,6 +229,10 @@ class Checkin(Base):
     """Daily standup check-in."""
 
     __tablename__ = "checkins"
+    __table_args__ = (
+        # Covers the recent-check-ins window in the status logic
+        Index("ix_checkins_user_date", "user_id", "date"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False, index=True)
@@ -265,6 +297,10 @@ class Quiz(Base):
     """Weekly evaluation quiz."""
 
     __tablename__ = "quizzes"
+    __table_args__ = (
+        # Covers the recent-completed-quizzes lookup behind knowledge score
+        Index("ix_quizzes_user_completed_created", "user_id", "completed", "created_at"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False, index=True)
@@ -380,14 +416,23 @@ class ConceptMastery(Base):
     """Concept mastery tracking for retention."""
 
     __tablename__ = "concept_mastery"
+    __table_args__ = (
+        # Covers the retention listing: filter by user, order by times_seen
+        Index("ix_concept_mastery_user_seen", "user_id", "times_seen"),
+        # Covers the weak-concept lookup: filter by user, order by ratio
+        Index("ix_concept_mastery_user_ratio", "user_id", "mastery_ratio"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False, index=True)
-    
+
     concept: Mapped[str] = mapped_column(String(200), nullable=False, index=True)
     times_seen: Mapped[int] = mapped_column(Integer, default=0)
     times_correct: Mapped[int] = mapped_column(Integer, default=0)
     times_wrong: Mapped[int] = mapped_column(Integer, default=0)
+    # Maintained alongside the counters so weak-concept queries can sort
+    # on an indexed column instead of dividing per row
+    mastery_ratio: Mapped[float] = mapped_column(Float, default=0.0)
     
     # Spaced repetition
     next_review_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
@@ -407,6 +452,12 @@ class MemoryRule(Base):
     """Deterministic memory rules (stable lessons)."""
 
     __tablename__ = "memory_rules"
+    __table_args__ = (
+        # One rule per type per user; lets rule updates run as atomic upserts
+        UniqueConstraint("user_id", "rule_type"),
+        # Covers the hot "active rules for user" lookup
+        Index("ix_memory_rules_user_active", "user_id", "is_active"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False, index=True)
@@ -461,6 +512,10 @@ class EmailLog(Base):
     """Email notification log."""
 
     __tablename__ = "email_logs"
+    __table_args__ = (
+        # Covers the log listing: filter by user, order by recency
+        Index("ix_email_log_user_created", "user_id", "created_at"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False, index=True)
@@ -1,7 +1,8 @@
 """Database session and engine configuration."""
 
-from typing import Generator
-from sqlalchemy import create_engine
+from typing import AsyncGenerator, Generator
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
 from functools import lru_cache
 
@@ -32,8 +33,10 @@ class DatabaseConfig:
         pool_settings = {}
 
         if dialect == "sqlite":
-            # SQLite-specific settings
+            # SQLite-specific settings; the busy timeout keeps concurrent
+            # writers waiting instead of failing with "database is locked"
             connect_args["check_same_thread"] = False
+            connect_args["timeout"] = 30
         else:
             # PostgreSQL connection pool settings
             pool_settings = {
@@ -43,10 +46,88 @@ class DatabaseConfig:
                 "pool_recycle": 1800,
             }
 
-        return create_engine(
+        engine = create_engine(
             database_url,
             connect_args=connect_args,
             echo=False,
+            # Compiled-statement cache: repeat query shapes skip SQL
+            # compilation (explicit so it can't be silently disabled)
+            query_cache_size=500,
+            **pool_settings,
+        )
+
+        if dialect == "sqlite":
+            event.listen(engine, "connect", cls._tune_sqlite_connection)
+
+        return engine
+
+    @staticmethod
+    def _tune_sqlite_connection(dbapi_connection, connection_record):
+        """Apply per-connection SQLite pragmas.
+
+        WAL lets readers proceed while a writer holds the log, and
+        synchronous=NORMAL drops the per-commit fsync that WAL makes safe
+        to skip. The cache/mmap/temp_store settings trade a bounded amount
+        of memory for fewer page reads. ANALYZE refreshes planner
+        statistics so the indexes added for hot queries actually get
+        picked; connections are pooled, so this runs rarely.
+        """
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.execute("PRAGMA cache_size=-65536")
+            cursor.execute("PRAGMA mmap_size=268435456")
+            cursor.execute("PRAGMA temp_store=MEMORY")
+            cursor.execute("ANALYZE")
+        finally:
+            cursor.close()
+
+    # Sync driver -> async driver URL translation
+    ASYNC_DRIVERS = {
+        "sqlite": "sqlite+aiosqlite",
+        "postgresql": "postgresql+asyncpg",
+    }
+
+    @classmethod
+    def to_async_url(cls, database_url: str) -> str:
+        """Rewrite a sync database URL to use its async driver."""
+        dialect = database_url.split(":")[0]
+        return database_url.replace(dialect, cls.ASYNC_DRIVERS.get(dialect, dialect), 1)
+
+    @classmethod
+    def get_async_engine(cls, database_url: str):
+        """Create an async SQLAlchemy engine with appropriate settings per dialect."""
+        dialect = database_url.split(":")[0]
+
+        if dialect not in cls.SUPPORTED_DIALECTS:
+            raise ValueError(
+                f"Unsupported database dialect: {dialect}. "
+                f"Supported: {cls.SUPPORTED_DIALECTS}"
+            )
+
+        connect_args = {}
+        pool_settings = {}
+
+        if dialect == "sqlite":
+            # SQLite-specific settings
+            connect_args["check_same_thread"] = False
+        else:
+            # PostgreSQL connection pool settings (async services run more
+            # concurrent queries per worker, so the pool is larger)
+            pool_settings = {
+                "pool_size": 20,
+                "max_overflow": 10,
+                "pool_timeout": 30,
+                "pool_recycle": 1800,
+                "pool_pre_ping": True,
+            }
+
+        return create_async_engine(
+            cls.to_async_url(database_url),
+            connect_args=connect_args,
+            echo=False,
+            query_cache_size=500,
             **pool_settings,
         )
 
@@ -54,6 +135,8 @@ class DatabaseConfig:
 # Global engine and session factory (lazy initialization)
 _engine = None
 _SessionLocal = None
+_async_engine = None
+_AsyncSessionLocal = None
 
 
 def get_engine(database_url: str | None = None):
@@ -100,6 +183,49 @@ def get_session(database_url: str | None = None) -> Generator[Session, None, Non
         db.close()
 
 
+def get_async_engine(database_url: str | None = None):
+    """Get or create the async database engine."""
+    global _async_engine
+
+    if _async_engine is None:
+        if database_url is None:
+            import os
+            database_url = os.getenv("DATABASE_URL", "sqlite:///./dev.db")
+        _async_engine = DatabaseConfig.get_async_engine(database_url)
+
+    return _async_engine
+
+
+def get_async_session_factory(database_url: str | None = None) -> async_sessionmaker:
+    """Get or create the async session factory."""
+    global _AsyncSessionLocal
+
+    if _AsyncSessionLocal is None:
+        engine = get_async_engine(database_url)
+        _AsyncSessionLocal = async_sessionmaker(
+            autoflush=False,
+            expire_on_commit=False,
+            bind=engine,
+        )
+
+    return _AsyncSessionLocal
+
+
+async def get_async_session(
+    database_url: str | None = None,
+) -> AsyncGenerator[AsyncSession, None]:
+    """Dependency for getting async database sessions.
+
+    Usage in FastAPI:
+        @app.get("/items")
+        async def get_items(db: AsyncSession = Depends(get_async_session)):
+            ...
+    """
+    AsyncSessionLocal = get_async_session_factory(database_url)
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
 def init_db(database_url: str | None = None):
     """Initialize database tables.
     
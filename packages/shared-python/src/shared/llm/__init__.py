@@ -1,10 +1,15 @@
 """LLM provider adapters."""
 
 from shared.llm.base import LLMProvider, LLMResponse
-from shared.llm.factory import get_llm_provider
+from shared.llm.embeddings import OpenAIEmbeddingClient
+from shared.llm.factory import aclose_llm_providers, get_llm_provider
+from shared.llm.semcache import SemanticLLMCache
 
 __all__ = [
     "LLMProvider",
     "LLMResponse",
+    "OpenAIEmbeddingClient",
+    "SemanticLLMCache",
+    "aclose_llm_providers",
     "get_llm_provider",
 ]
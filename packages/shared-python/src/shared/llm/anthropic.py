@@ -3,7 +3,7 @@
 import json
 from typing import AsyncGenerator, Any, Optional
 from anthropic import AsyncAnthropic
-from shared.llm.base import LLMProvider, LLMResponse
+from shared.llm.base import LLMProvider, LLMResponse, llm_semaphore
 
 
 class AnthropicProvider(LLMProvider):
@@ -27,6 +27,28 @@ class AnthropicProvider(LLMProvider):
     def provider_name(self) -> str:
         return "anthropic"
 
+    async def aclose(self) -> None:
+        """Close the SDK client's pooled HTTP connections."""
+        await self.client.close()
+
+    @staticmethod
+    def _system_blocks(system_text: str):
+        """Build a cache-eligible system block list.
+
+        Marking the system prompt with ephemeral cache_control lets the API
+        reuse its processed prefix across calls: the service system prompts
+        are static, so every call after the first hits the prompt cache.
+        """
+        if not system_text:
+            return ""
+        return [
+            {
+                "type": "text",
+                "text": system_text,
+                "cache_control": {"type": "ephemeral"},
+            }
+        ]
+
     async def complete(
         self,
         prompt: str,
@@ -38,12 +60,12 @@ class AnthropicProvider(LLMProvider):
         response = await self.client.messages.create(
             model=self.model,
             max_tokens=max_tokens,
-            system=system_prompt or "",
+            system=self._system_blocks(system_prompt or ""),
             messages=[{"role": "user", "content": prompt}],
             temperature=temperature,
             **kwargs,
         )
-        
+
         content = ""
         if response.content:
             content = response.content[0].text if response.content else ""
@@ -69,7 +91,7 @@ class AnthropicProvider(LLMProvider):
         async with self.client.messages.stream(
             model=self.model,
             max_tokens=max_tokens,
-            system=system_prompt or "",
+            system=self._system_blocks(system_prompt or ""),
             messages=[{"role": "user", "content": prompt}],
             temperature=temperature,
             **kwargs,
@@ -95,15 +117,16 @@ class AnthropicProvider(LLMProvider):
         if system_prompt:
             full_system = f"{system_prompt}\n\n{schema_instruction}"
         
-        response = await self.client.messages.create(
-            model=self.model,
-            max_tokens=4096,
-            system=full_system,
-            messages=[{"role": "user", "content": prompt}],
-            temperature=temperature,
-            **kwargs,
-        )
-        
+        async with llm_semaphore():
+            response = await self.client.messages.create(
+                model=self.model,
+                max_tokens=4096,
+                system=self._system_blocks(full_system),
+                messages=[{"role": "user", "content": prompt}],
+                temperature=temperature,
+                **kwargs,
+            )
+
         content = response.content[0].text if response.content else "{}"
         
         try:
@@ -3,7 +3,7 @@
 import json
 from typing import AsyncGenerator, Any, Optional
 from openai import AsyncAzureOpenAI
-from shared.llm.base import LLMProvider, LLMResponse
+from shared.llm.base import LLMProvider, LLMResponse, llm_semaphore
 
 
 class AzureOpenAIProvider(LLMProvider):
@@ -35,6 +35,10 @@ class AzureOpenAIProvider(LLMProvider):
     def provider_name(self) -> str:
         return "azure"
 
+    async def aclose(self) -> None:
+        """Close the SDK client's pooled HTTP connections."""
+        await self.client.close()
+
     async def complete(
         self,
         prompt: str,
@@ -123,22 +127,24 @@ class AzureOpenAIProvider(LLMProvider):
         messages.append({"role": "user", "content": prompt})
         
         try:
-            response = await self.client.chat.completions.create(
-                model=self.deployment,
-                messages=messages,
-                temperature=temperature,
-                response_format={"type": "json_object"},
-                **kwargs,
-            )
+            async with llm_semaphore():
+                response = await self.client.chat.completions.create(
+                    model=self.deployment,
+                    messages=messages,
+                    temperature=temperature,
+                    response_format={"type": "json_object"},
+                    **kwargs,
+                )
             content = response.choices[0].message.content or "{}"
             return json.loads(content)
         except Exception:
-            response = await self.client.chat.completions.create(
-                model=self.deployment,
-                messages=messages,
-                temperature=temperature,
-                **kwargs,
-            )
+            async with llm_semaphore():
+                response = await self.client.chat.completions.create(
+                    model=self.deployment,
+                    messages=messages,
+                    temperature=temperature,
+                    **kwargs,
+                )
             content = response.choices[0].message.content or "{}"
             try:
                 return json.loads(content)
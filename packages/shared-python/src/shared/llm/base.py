@@ -1,10 +1,29 @@
 """Abstract LLM provider interface."""
 
+import asyncio
+import json
+import os
+import re
 from abc import ABC, abstractmethod
 from typing import AsyncGenerator, Any, Optional
 from pydantic import BaseModel
 
 
+# Process-wide bound on in-flight LLM calls: fan-out call sites (e.g.
+# gather over quiz answers) across all providers share one budget so
+# bursts cannot thrash the provider's rate limits; tune via env
+_LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+_llm_semaphore: Optional[asyncio.Semaphore] = None
+
+
+def llm_semaphore() -> asyncio.Semaphore:
+    """Shared semaphore bounding concurrent LLM provider calls."""
+    global _llm_semaphore
+    if _llm_semaphore is None:
+        _llm_semaphore = asyncio.Semaphore(_LLM_MAX_CONCURRENCY)
+    return _llm_semaphore
+
+
 class LLMResponse(BaseModel):
     """Standard response from LLM providers."""
     
@@ -100,6 +119,114 @@ class LLMProvider(ABC):
         """
         ...
 
+    async def structured_output_stream(
+        self,
+        prompt: str,
+        schema: dict,
+        array_field: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.3,
+        **kwargs: Any,
+    ) -> AsyncGenerator[tuple, None]:
+        """Stream structured output, yielding array items as they complete.
+
+        Parses the token stream incrementally so callers can act on each
+        element of the named top-level JSON array before the final token
+        arrives (e.g. insert rows while the LLM is still generating).
+
+        Args:
+            prompt: The user prompt/message
+            schema: JSON schema for the expected output
+            array_field: Name of the top-level array to yield items from
+            system_prompt: Optional system instructions
+            temperature: Sampling temperature
+            **kwargs: Provider-specific parameters
+
+        Yields:
+            ("item", obj) for each completed array element, then
+            ("final", full_object) once the stream ends
+        """
+        schema_instruction = (
+            f"Respond with valid JSON matching this schema:\n"
+            f"```json\n{json.dumps(schema, indent=2)}\n```\n"
+            f"Only output the JSON, no other text."
+        )
+        full_system = schema_instruction
+        if system_prompt:
+            full_system = f"{system_prompt}\n\n{schema_instruction}"
+
+        text = ""
+        array_pos = None  # index just past the array's opening bracket
+        array_done = False
+        i = 0
+        depth = 0
+        in_str = False
+        esc = False
+        item_start = None
+
+        async for token in self.stream(
+            prompt=prompt,
+            system_prompt=full_system,
+            temperature=temperature,
+            **kwargs,
+        ):
+            text += token
+
+            if array_pos is None:
+                field_at = text.find(f'"{array_field}"')
+                if field_at != -1:
+                    bracket = text.find("[", field_at)
+                    if bracket != -1:
+                        array_pos = bracket + 1
+                        i = array_pos
+
+            if array_pos is None or array_done:
+                continue
+
+            # Scan newly arrived characters, tracking string/brace state so
+            # each completed top-level object can be parsed immediately
+            while i < len(text):
+                ch = text[i]
+                if in_str:
+                    if esc:
+                        esc = False
+                    elif ch == "\\":
+                        esc = True
+                    elif ch == '"':
+                        in_str = False
+                elif ch == '"':
+                    in_str = True
+                elif ch == "{":
+                    if depth == 0:
+                        item_start = i
+                    depth += 1
+                elif ch == "}":
+                    depth -= 1
+                    if depth == 0 and item_start is not None:
+                        yield ("item", json.loads(text[item_start:i + 1]))
+                        item_start = None
+                elif ch == "]" and depth == 0:
+                    array_done = True
+                    break
+                i += 1
+
+        # Full-document parse once the stream is complete
+        try:
+            final = json.loads(text)
+        except json.JSONDecodeError:
+            json_match = re.search(r"\{.*\}", text, re.DOTALL)
+            if not json_match:
+                raise ValueError(f"Could not parse JSON from response: {text}")
+            final = json.loads(json_match.group())
+
+        yield ("final", final)
+
+    async def aclose(self) -> None:
+        """Release the provider's underlying HTTP resources.
+
+        Default is a no-op; providers holding a pooled client override it.
+        """
+
     async def chat(
         self,
         messages: list[dict],
@@ -0,0 +1,42 @@
+"""Embedding client adapters."""
+
+from typing import List, Optional
+from openai import AsyncOpenAI
+
+from shared.llm.base import llm_semaphore
+
+
+class OpenAIEmbeddingClient:
+    """Async client for the OpenAI embeddings endpoint.
+
+    Satisfies the ``async embed(text) -> list[float]`` contract that
+    SemanticLLMCache expects. Embedding calls share the process-wide
+    LLM semaphore so cache lookups cannot crowd out completion traffic.
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model: str = "text-embedding-3-small",
+    ):
+        """Initialize OpenAI embedding client.
+
+        Args:
+            api_key: OpenAI API key (or from OPENAI_API_KEY env var)
+            model: Embedding model to use (default: text-embedding-3-small)
+        """
+        self.model = model
+        self.client = AsyncOpenAI(api_key=api_key)
+
+    async def embed(self, text: str) -> List[float]:
+        """Return the embedding vector for a single text."""
+        async with llm_semaphore():
+            response = await self.client.embeddings.create(
+                model=self.model,
+                input=text,
+            )
+        return response.data[0].embedding
+
+    async def aclose(self) -> None:
+        """Close the SDK client's pooled HTTP connections."""
+        await self.client.close()
@@ -4,6 +4,11 @@ import os
 from typing import Optional
 from shared.llm.base import LLMProvider
 
+# Default providers are cached per name so every service instance shares one
+# SDK client (and its HTTP connection pool) instead of opening a new pool per
+# request. Explicitly configured providers are never cached.
+_provider_cache: dict[str, LLMProvider] = {}
+
 
 def get_llm_provider(
     provider: Optional[str] = None,
@@ -24,9 +29,29 @@ def get_llm_provider(
     """
     if provider is None:
         provider = os.getenv("LLM_PROVIDER", "openai")
-    
+
     provider = provider.lower()
-    
+
+    if not kwargs and provider in _provider_cache:
+        return _provider_cache[provider]
+
+    instance = _build_provider(provider, **kwargs)
+
+    if not kwargs:
+        _provider_cache[provider] = instance
+
+    return instance
+
+
+async def aclose_llm_providers() -> None:
+    """Close cached providers' HTTP clients; call on application shutdown."""
+    for instance in _provider_cache.values():
+        await instance.aclose()
+    _provider_cache.clear()
+
+
+def _build_provider(provider: str, **kwargs) -> LLMProvider:
+    """Construct a provider instance for the given name."""
     if provider == "openai":
         from shared.llm.openai import OpenAIProvider
         
@@ -3,7 +3,7 @@
 import json
 from typing import AsyncGenerator, Any, Optional
 import httpx
-from shared.llm.base import LLMProvider, LLMResponse
+from shared.llm.base import LLMProvider, LLMResponse, llm_semaphore
 
 
 class OllamaProvider(LLMProvider):
@@ -22,11 +22,21 @@ class OllamaProvider(LLMProvider):
         """
         self.base_url = base_url.rstrip("/")
         self.model = model
+        # One pooled client for the provider's lifetime: per-call clients
+        # pay a fresh TCP+TLS handshake on every LLM request
+        self.client = httpx.AsyncClient(
+            timeout=120.0,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+        )
 
     @property
     def provider_name(self) -> str:
         return "ollama"
 
+    async def aclose(self) -> None:
+        """Close the pooled HTTP client."""
+        await self.client.aclose()
+
     async def complete(
         self,
         prompt: str,
@@ -35,36 +45,35 @@ class OllamaProvider(LLMProvider):
         max_tokens: int = 1024,
         **kwargs: Any,
     ) -> LLMResponse:
-        async with httpx.AsyncClient(timeout=120.0) as client:
-            payload = {
-                "model": self.model,
-                "prompt": prompt,
-                "stream": False,
-                "options": {
-                    "temperature": temperature,
-                    "num_predict": max_tokens,
-                },
-            }
-            
-            if system_prompt:
-                payload["system"] = system_prompt
-            
-            response = await client.post(
-                f"{self.base_url}/api/generate",
-                json=payload,
-            )
-            response.raise_for_status()
-            data = response.json()
-            
-            return LLMResponse(
-                content=data.get("response", ""),
-                model=data.get("model", self.model),
-                usage={
-                    "prompt_tokens": data.get("prompt_eval_count", 0),
-                    "completion_tokens": data.get("eval_count", 0),
-                },
-                finish_reason="stop" if data.get("done") else None,
-            )
+        payload = {
+            "model": self.model,
+            "prompt": prompt,
+            "stream": False,
+            "options": {
+                "temperature": temperature,
+                "num_predict": max_tokens,
+            },
+        }
+
+        if system_prompt:
+            payload["system"] = system_prompt
+
+        response = await self.client.post(
+            f"{self.base_url}/api/generate",
+            json=payload,
+        )
+        response.raise_for_status()
+        data = response.json()
+
+        return LLMResponse(
+            content=data.get("response", ""),
+            model=data.get("model", self.model),
+            usage={
+                "prompt_tokens": data.get("prompt_eval_count", 0),
+                "completion_tokens": data.get("eval_count", 0),
+            },
+            finish_reason="stop" if data.get("done") else None,
+        )
 
     async def stream(
         self,
@@ -74,30 +83,29 @@ class OllamaProvider(LLMProvider):
         max_tokens: int = 1024,
         **kwargs: Any,
     ) -> AsyncGenerator[str, None]:
-        async with httpx.AsyncClient(timeout=120.0) as client:
-            payload = {
-                "model": self.model,
-                "prompt": prompt,
-                "stream": True,
-                "options": {
-                    "temperature": temperature,
-                    "num_predict": max_tokens,
-                },
-            }
-            
-            if system_prompt:
-                payload["system"] = system_prompt
-            
-            async with client.stream(
-                "POST",
-                f"{self.base_url}/api/generate",
-                json=payload,
-            ) as response:
-                async for line in response.aiter_lines():
-                    if line:
-                        data = json.loads(line)
-                        if data.get("response"):
-                            yield data["response"]
+        payload = {
+            "model": self.model,
+            "prompt": prompt,
+            "stream": True,
+            "options": {
+                "temperature": temperature,
+                "num_predict": max_tokens,
+            },
+        }
+
+        if system_prompt:
+            payload["system"] = system_prompt
+
+        async with self.client.stream(
+            "POST",
+            f"{self.base_url}/api/generate",
+            json=payload,
+        ) as response:
+            async for line in response.aiter_lines():
+                if line:
+                    data = json.loads(line)
+                    if data.get("response"):
+                        yield data["response"]
 
     async def structured_output(
         self,
@@ -117,12 +125,13 @@ class OllamaProvider(LLMProvider):
         if system_prompt:
             full_system = f"{system_prompt}\n\n{schema_instruction}"
         
-        response = await self.complete(
-            prompt=prompt,
-            system_prompt=full_system,
-            temperature=temperature,
-            max_tokens=4096,
-        )
+        async with llm_semaphore():
+            response = await self.complete(
+                prompt=prompt,
+                system_prompt=full_system,
+                temperature=temperature,
+                max_tokens=4096,
+            )
         
         content = response.content
         
@@ -3,7 +3,7 @@
 import json
 from typing import AsyncGenerator, Any, Optional
 from openai import AsyncOpenAI
-from shared.llm.base import LLMProvider, LLMResponse
+from shared.llm.base import LLMProvider, LLMResponse, llm_semaphore
 
 
 class OpenAIProvider(LLMProvider):
@@ -29,6 +29,10 @@ class OpenAIProvider(LLMProvider):
     def provider_name(self) -> str:
         return "openai"
 
+    async def aclose(self) -> None:
+        """Close the SDK client's pooled HTTP connections."""
+        await self.client.close()
+
     async def complete(
         self,
         prompt: str,
@@ -118,23 +122,25 @@ class OpenAIProvider(LLMProvider):
         
         # Try using response_format if available (GPT-4o and newer)
         try:
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                temperature=temperature,
-                response_format={"type": "json_object"},
-                **kwargs,
-            )
+            async with llm_semaphore():
+                response = await self.client.chat.completions.create(
+                    model=self.model,
+                    messages=messages,
+                    temperature=temperature,
+                    response_format={"type": "json_object"},
+                    **kwargs,
+                )
             content = response.choices[0].message.content or "{}"
             return json.loads(content)
         except Exception:
             # Fallback for older models
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                temperature=temperature,
-                **kwargs,
-            )
+            async with llm_semaphore():
+                response = await self.client.chat.completions.create(
+                    model=self.model,
+                    messages=messages,
+                    temperature=temperature,
+                    **kwargs,
+                )
             content = response.choices[0].message.content or "{}"
             # Try to extract JSON from response
             try:
@@ -0,0 +1,82 @@
+"""Semantic cache for LLM structured-output calls."""
+
+import hashlib
+import json
+import math
+from typing import Any, Dict, List, Optional
+
+from shared.observability import get_logger
+
+logger = get_logger(__name__)
+
+
+def _cosine(a: List[float], b: List[float]) -> float:
+    """Cosine similarity between two equal-length vectors."""
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+
+class SemanticLLMCache:
+    """Embedding-similarity cache for structured LLM responses.
+
+    Responses are bucketed per schema (so a quiz-generation response can
+    never satisfy a judge lookup) and matched by cosine similarity of
+    prompt embeddings, so near-identical prompts across users and
+    attempts reuse one LLM response. Redis outages degrade to cache
+    misses, mirroring the services' other Redis-backed caches.
+
+    Args:
+        embedding_client: Object with ``async embed(text) -> list[float]``
+        redis: Async Redis client used for storage
+        threshold: Minimum cosine similarity for a hit
+        ttl: Bucket expiry in seconds, refreshed on write
+    """
+
+    def __init__(
+        self,
+        embedding_client: Any,
+        redis: Any,
+        threshold: float = 0.92,
+        ttl: int = 3600,
+        max_entries: int = 256,
+    ):
+        self.embedding_client = embedding_client
+        self.redis = redis
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+
+    @staticmethod
+    def _bucket_key(schema: Dict) -> str:
+        schema_hash = hashlib.sha256(
+            json.dumps(schema, sort_keys=True).encode()
+        ).hexdigest()
+        return f"semcache:{schema_hash}"
+
+    async def get(self, prompt: str, schema: Dict) -> Optional[Dict]:
+        """Return the cached response most similar to prompt, if any."""
+        try:
+            entries = await self.redis.lrange(self._bucket_key(schema), 0, -1)
+            if not entries:
+                return None
+
+            embedding = await self.embedding_client.embed(prompt)
+            for entry in entries:
+                vector, response = json.loads(entry)
+                if _cosine(embedding, vector) >= self.threshold:
+                    return response
+        except Exception as e:
+            logger.warning("Semantic cache lookup failed", error=str(e))
+        return None
+
+    async def set(self, prompt: str, schema: Dict, response: Dict) -> None:
+        """Store a response under the prompt's embedding."""
+        try:
+            key = self._bucket_key(schema)
+            embedding = await self.embedding_client.embed(prompt)
+            await self.redis.lpush(key, json.dumps([embedding, response]))
+            await self.redis.ltrim(key, 0, self.max_entries - 1)
+            await self.redis.expire(key, self.ttl)
+        except Exception as e:
+            logger.warning("Semantic cache store failed", error=str(e))